@@ -1,20 +1,17 @@
 import logging
-from uuid import UUID, uuid4
+from uuid import uuid4
 
-from fastapi import APIRouter, Cookie, Depends, Form, HTTPException
+from fastapi import APIRouter, Cookie, Depends, Form, HTTPException, Response
 from pydantic import EmailStr
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth.helpers import (
-    SessionService,
-    current_user,
-    hash_raw_password,
-    verify_raw_password,
-)
+from app.auth.helpers import SessionService, current_user
+from app.auth.passwords import hash_password, password_needs_rehash, verify_password
 from app.core.config import USER_SESSION_COOKIE_NAME
 from app.core.database import async_db_session
 from app.core.models.user import User, UserSchema
+from app.core.responses import json_response, with_cookies
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -33,6 +30,7 @@ api_auth_router = APIRouter(prefix="/auth", tags=["auth"])
 
 @api_auth_router.post("/register", response_model=UserSchema)
 async def api_register(
+    response: Response,
     session_service: SessionService = Depends(SessionService),
     email: EmailStr = Form(),
     nickname: str = Form(),
@@ -49,27 +47,29 @@ async def api_register(
         user_id=uuid4(),
         email=email,
         nickname=nickname,
-        hashed_password=hash_raw_password(password),
+        hashed_password=await hash_password(password),
     )
 
     db_session.add(user)
     await db_session.commit()
 
-    await session_service.save_session(user.user_id)
+    await session_service.save_session(user)
 
     logger.info(f"Пользователь {user.email} прошёл регистрацию")
-    return user.to_schema()
+    return json_response(user.construct_schema(), response)
 
 
 @api_auth_router.get("/info", response_model=UserSchema)
 async def api_user_info(
+    response: Response,
     user: User = Depends(current_user),
 ):
-    return user.to_schema()
+    return json_response(user.construct_schema(), response)
 
 
 @api_auth_router.post("/login", response_model=UserSchema)
 async def api_login(
+    response: Response,
     session_service: SessionService = Depends(SessionService),
     email: EmailStr = Form(),
     password: str = Form(min_length=8, max_length=50),
@@ -77,18 +77,23 @@ async def api_login(
 ):
     user = await db_session.scalar(select(User).where(User.email == email))
 
-    if user is None or not verify_raw_password(password, user.hashed_password):
+    if user is None or not await verify_password(password, user.hashed_password):
         logger.warning(f"Пользователь {email} не прошёл авторизацию")
         raise HTTPException(401)
 
-    await session_service.refresh_session(user.user_id)
+    if password_needs_rehash(user.hashed_password):
+        user.hashed_password = await hash_password(password)
+        await db_session.commit()
+
+    await session_service.refresh_session(user)
 
     logger.info(f"Пользователь {user.email} прошёл авторизацию")
-    return user.to_schema()
+    return json_response(user.construct_schema(), response)
 
 
 @api_auth_router.post("/logout")
 async def api_logout(
+    response: Response,
     session_service: SessionService = Depends(SessionService),
     user_session_cookie: str | None = Cookie(None, alias=USER_SESSION_COOKIE_NAME),
     db_session: AsyncSession = Depends(async_db_session),
@@ -96,10 +101,12 @@ async def api_logout(
     if user_session_cookie is None:
         raise HTTPException(401)
 
-    user_id, _ = user_session_cookie.split(".")
-    await session_service.delete_session(UUID(user_id))
+    user_id = session_service.cookie_user_id(user_session_cookie)
+    if user_id is None:
+        await session_service.delete_session(None)
+        return with_cookies(Response(status_code=204), response)
 
-    email = await db_session.scalar(
-        select(User.email).where(User.user_id == UUID(user_id))
-    )
+    await session_service.delete_session(user_id)
+
+    email = await db_session.scalar(select(User.email).where(User.user_id == user_id))
     logger.info(f"Пользователь {email} вышел из системы")
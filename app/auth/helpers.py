@@ -1,36 +1,74 @@
-import base64
-import hashlib
-import os
 from datetime import datetime, timedelta
 from uuid import UUID, uuid4
 
 from fastapi import Cookie, Depends, HTTPException, Response
-from sqlalchemy import delete, select
+from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
+from app.auth.tokens import decode_session_token, encode_session_token
+from app.core.cache import cache
 from app.core.config import (
-    SALT_SIZE,
+    USER_SESSION_CACHE_TTL,
     USER_SESSION_COOKIE_NAME,
     USER_SESSION_EXP,
+    USER_SESSION_MODE,
     USER_SESSION_REFRESH,
 )
 from app.core.database import async_db_session
-from app.core.models.user import Role, User, UserSession
+from app.core.models.user import Role, User, UserSession, UserSessionSchema
 
+USER_SESSION_KEY = "sessions:{}"
+USER_SESSION_GENERATION_KEY = "sessions:generation:{}"
 
-def hash_raw_password(raw_password: str):
-    salt = os.urandom(SALT_SIZE)
-    key = hashlib.pbkdf2_hmac("sha256", raw_password.encode(), salt, 100000)
-    return base64.b64encode(salt + key).decode()
 
+async def get_cached_session(user_id: UUID) -> UserSessionSchema | None:
+    if not cache.shared:
+        return None
+    value = await cache.get(USER_SESSION_KEY.format(user_id))
+    return UserSessionSchema.model_validate_json(value) if value else None
+
+
+async def set_cached_session(user_session: UserSessionSchema):
+    if not cache.shared:
+        return
+    ttl = min(
+        USER_SESSION_CACHE_TTL,
+        (user_session.expiration_at - datetime.utcnow()).total_seconds(),
+    )
+    if ttl > 0:
+        await cache.set(
+            USER_SESSION_KEY.format(user_session.user.user_id),
+            user_session.model_dump_json().encode(),
+            ttl,
+        )
+
+
+async def invalidate_cached_session(user_id: UUID):
+    await cache.delete(USER_SESSION_KEY.format(user_id))
 
-def verify_raw_password(raw_password: str, hashed_password: str):
-    decoded = base64.b64decode(hashed_password.encode())
-    salt = decoded[:SALT_SIZE]
-    key = decoded[SALT_SIZE:]
-    new_key = hashlib.pbkdf2_hmac("sha256", raw_password.encode(), salt, 100000)
-    return key == new_key
+
+async def set_session_generation(user_id: UUID, generation: int):
+    await cache.set(
+        USER_SESSION_GENERATION_KEY.format(user_id),
+        str(generation).encode(),
+        USER_SESSION_CACHE_TTL,
+    )
+
+
+async def get_session_generation(db_session: AsyncSession, user_id: UUID) -> int:
+    value = await cache.get(USER_SESSION_GENERATION_KEY.format(user_id))
+    if value is not None:
+        return int(value)
+
+    generation = await db_session.scalar(
+        select(User.session_generation).where(User.user_id == user_id)
+    )
+    if generation is None:
+        raise HTTPException(401)
+
+    await set_session_generation(user_id, generation)
+    return generation
 
 
 class SessionService:
@@ -41,7 +79,7 @@ class SessionService:
         self._db_session = db_session
 
     @classmethod
-    def is_need_refresh(cls, user_session: UserSession):
+    def is_need_refresh(cls, user_session: UserSession | UserSessionSchema):
         return (
             user_session.created_at + timedelta(seconds=USER_SESSION_REFRESH)
             <= datetime.utcnow()
@@ -57,21 +95,10 @@ class SessionService:
             expiration_at=_now + timedelta(seconds=USER_SESSION_EXP),
         )
 
-    async def delete_session(self, user_id: UUID | None):
-        self._response.delete_cookie(USER_SESSION_COOKIE_NAME)
-        if user_id:
-            await self._db_session.execute(
-                delete(UserSession).where(UserSession.user_id == user_id)
-            )
-            await self._db_session.commit()
-
-    async def save_session(self, user_id: UUID):
-        user_session = self.create_session(user_id)
-        self._db_session.add(user_session)
-        await self._db_session.commit()
+    def _set_cookie(self, value: str):
         self._response.set_cookie(
             USER_SESSION_COOKIE_NAME,
-            f"{user_id}.{user_session.session_id}",
+            value,
             max_age=USER_SESSION_EXP,
             path="/",
             httponly=True,
@@ -79,9 +106,53 @@ class SessionService:
             samesite="strict",
         )
 
-    async def refresh_session(self, user_id: UUID):
-        await self.delete_session(user_id)
-        await self.save_session(user_id)
+    def cookie_user_id(self, user_session_cookie: str) -> UUID | None:
+        if USER_SESSION_MODE == "token":
+            token = decode_session_token(user_session_cookie)
+            return token.user.user_id if token else None
+        try:
+            return UUID(user_session_cookie.split(".")[0])
+        except ValueError:
+            return None
+
+    async def delete_session(self, user_id: UUID | None):
+        self._response.delete_cookie(USER_SESSION_COOKIE_NAME)
+        if not user_id:
+            return
+
+        if USER_SESSION_MODE == "token":
+            generation = await self._db_session.scalar(
+                update(User)
+                .where(User.user_id == user_id)
+                .values(session_generation=User.session_generation + 1)
+                .returning(User.session_generation)
+            )
+            await self._db_session.commit()
+            if generation is not None:
+                await set_session_generation(user_id, generation)
+            return
+
+        await self._db_session.execute(
+            delete(UserSession).where(UserSession.user_id == user_id)
+        )
+        await self._db_session.commit()
+        await invalidate_cached_session(user_id)
+
+    async def save_session(self, user: User):
+        if USER_SESSION_MODE == "token":
+            generation = await get_session_generation(self._db_session, user.user_id)
+            self._set_cookie(encode_session_token(user, generation))
+            return
+
+        user_session = self.create_session(user.user_id)
+        self._db_session.add(user_session)
+        await self._db_session.commit()
+        await invalidate_cached_session(user.user_id)
+        self._set_cookie(f"{user.user_id}.{user_session.session_id}")
+
+    async def refresh_session(self, user: User):
+        await self.delete_session(user.user_id)
+        await self.save_session(user)
 
 
 async def current_admin(
@@ -103,26 +174,69 @@ async def current_user(
     if user_session_cookie is None:
         raise HTTPException(401)
 
-    user_id, user_session_id = user_session_cookie.split(".")
-    user_session = await db_session.scalar(
-        select(UserSession)
-        .where(UserSession.session_id == UUID(user_session_id))
-        .where(UserSession.user_id == UUID(user_id))
-        .options(joinedload(UserSession.user))
-    )
+    if USER_SESSION_MODE == "token":
+        return await current_token_user(
+            session_service, user_session_cookie, db_session
+        )
 
-    if user_session is None:
-        raise HTTPException(401)
+    user_id, user_session_id = map(UUID, user_session_cookie.split("."))
 
-    user = user_session.user
+    user_session = await get_cached_session(user_id)
+    if user_session is None or user_session.session_id != user_session_id:
+        db_user_session = await db_session.scalar(
+            select(UserSession)
+            .where(UserSession.session_id == user_session_id)
+            .where(UserSession.user_id == user_id)
+            .options(joinedload(UserSession.user))
+        )
+
+        if db_user_session is None:
+            raise HTTPException(401)
+
+        user_session = UserSessionSchema(
+            session_id=db_user_session.session_id,
+            expiration_at=db_user_session.expiration_at,
+            created_at=db_user_session.created_at,
+            user=db_user_session.user.to_schema(),
+        )
+        await set_cached_session(user_session)
 
     if user_session.expiration_at <= datetime.utcnow():
-        await session_service.delete_session(user.user_id)
+        await session_service.delete_session(user_id)
         raise HTTPException(401)
 
+    user = User(**user_session.user.model_dump())
+
     if SessionService.is_need_refresh(user_session):
-        await session_service.refresh_session(user.user_id)
+        await session_service.refresh_session(user)
+
+    return user
+
+
+async def current_token_user(
+    session_service: SessionService,
+    user_session_cookie: str,
+    db_session: AsyncSession,
+) -> User:
+    token = decode_session_token(user_session_cookie)
+    if token is None:
+        await session_service.delete_session(None)
+        raise HTTPException(401)
+
+    generation = await get_session_generation(db_session, token.user.user_id)
+    if token.generation != generation:
+        await session_service.delete_session(None)
+        raise HTTPException(401)
+
+    if token.issued_at + timedelta(seconds=USER_SESSION_REFRESH) > datetime.utcnow():
+        return User(**token.user.model_dump())
+
+    user = await db_session.get(User, token.user.user_id)
+    if user is None:
+        await session_service.delete_session(None)
+        raise HTTPException(401)
 
+    await session_service.save_session(user)
     return user
 
 
@@ -0,0 +1,154 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from fastapi import HTTPException
+
+from app.core.config import (
+    PASSWORD_HASH_ALGORITHM,
+    PASSWORD_HASH_QUEUE_SIZE,
+    PASSWORD_HASH_WORKERS,
+    PASSWORD_PBKDF2_ITERATIONS,
+    PASSWORD_SCRYPT_N,
+    PASSWORD_SCRYPT_P,
+    PASSWORD_SCRYPT_R,
+    SALT_SIZE,
+)
+
+logger = logging.getLogger(__name__)
+
+LEGACY = "legacy"
+PBKDF2_SHA256 = "pbkdf2_sha256"
+SCRYPT = "scrypt"
+
+
+LEGACY_PBKDF2_ITERATIONS = 100000
+
+
+def _b64encode(value: bytes) -> str:
+    return base64.b64encode(value).decode()
+
+
+def _b64decode(value: str) -> bytes:
+    return base64.b64decode(value.encode())
+
+
+def _pbkdf2(raw_password: str, salt: bytes, iterations: int) -> bytes:
+    return hashlib.pbkdf2_hmac("sha256", raw_password.encode(), salt, iterations)
+
+
+def _scrypt(raw_password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(
+        raw_password.encode(), salt=salt, n=n, r=r, p=p, maxmem=256 * n * r * p
+    )
+
+
+def _current_params() -> tuple[int, ...]:
+    if PASSWORD_HASH_ALGORITHM == PBKDF2_SHA256:
+        return (PASSWORD_PBKDF2_ITERATIONS,)
+    if PASSWORD_HASH_ALGORITHM == SCRYPT:
+        return (PASSWORD_SCRYPT_N, PASSWORD_SCRYPT_R, PASSWORD_SCRYPT_P)
+    raise RuntimeError(f"Unknown PASSWORD_HASH_ALGORITHM: {PASSWORD_HASH_ALGORITHM}")
+
+
+def _parse_hash(hashed_password: str) -> tuple[str, tuple[int, ...], bytes, bytes]:
+    if "$" not in hashed_password:
+        decoded = _b64decode(hashed_password)
+        return (
+            LEGACY,
+            (LEGACY_PBKDF2_ITERATIONS,),
+            decoded[:SALT_SIZE],
+            decoded[SALT_SIZE:],
+        )
+
+    algorithm, *params, salt, key = hashed_password.split("$")
+    return algorithm, tuple(map(int, params)), _b64decode(salt), _b64decode(key)
+
+
+def _derive_key(
+    raw_password: str, algorithm: str, params: tuple[int, ...], salt: bytes
+) -> bytes:
+    if algorithm in (PBKDF2_SHA256, LEGACY):
+        return _pbkdf2(raw_password, salt, *params)
+    if algorithm == SCRYPT:
+        return _scrypt(raw_password, salt, *params)
+    raise ValueError(f"Unknown password hash algorithm: {algorithm}")
+
+
+def hash_raw_password(raw_password: str):
+    params = _current_params()
+    salt = os.urandom(SALT_SIZE)
+    key = _derive_key(raw_password, PASSWORD_HASH_ALGORITHM, params, salt)
+    return "$".join(
+        [PASSWORD_HASH_ALGORITHM, *map(str, params), _b64encode(salt), _b64encode(key)]
+    )
+
+
+def verify_raw_password(raw_password: str, hashed_password: str):
+    try:
+        algorithm, params, salt, key = _parse_hash(hashed_password)
+        new_key = _derive_key(raw_password, algorithm, params, salt)
+    except (ValueError, TypeError):
+        logger.warning("Stored password hash cannot be parsed")
+        return False
+    return hmac.compare_digest(key, new_key)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    algorithm, params, _, _ = _parse_hash(hashed_password)
+    return algorithm != PASSWORD_HASH_ALGORITHM or params != _current_params()
+
+
+class PasswordHasher:
+    def __init__(self, workers: int, queue_size: int):
+        self._workers = workers
+        self._queue_size = queue_size
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hasher"
+        )
+
+        self.pending = 0
+        self.max_pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self.pending >= self._workers + self._queue_size:
+            self.rejected += 1
+            raise HTTPException(503, "Too many authentication requests")
+
+        self.pending += 1
+        self.max_pending = max(self.max_pending, self.pending)
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "workers": self._workers,
+            "queue_size": self._queue_size,
+            "running": min(self.pending, self._workers),
+            "queued": max(self.pending - self._workers, 0),
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+
+password_hasher = PasswordHasher(PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_SIZE)
+
+
+async def hash_password(raw_password: str) -> str:
+    return await password_hasher.run(hash_raw_password, raw_password)
+
+
+async def verify_password(raw_password: str, hashed_password: str) -> bool:
+    return await password_hasher.run(verify_raw_password, raw_password, hashed_password)
@@ -0,0 +1,60 @@
+import base64
+import hashlib
+import hmac
+from datetime import datetime, timedelta
+
+from app.core.config import (
+    CACHE_BACKEND,
+    USER_SESSION_EXP,
+    USER_SESSION_MODE,
+    USER_SESSION_SECRET,
+)
+from app.core.models.user import SessionTokenSchema, User
+
+if USER_SESSION_MODE == "token":
+    assert USER_SESSION_SECRET, "USER_SESSION_SECRET is not set"
+    assert CACHE_BACKEND != "memory", (
+        "USER_SESSION_MODE=token needs a CACHE_BACKEND shared by all workers"
+    )
+
+
+def _b64encode(value: bytes) -> str:
+    return base64.urlsafe_b64encode(value).decode().rstrip("=")
+
+
+def _b64decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode((value + "=" * (-len(value) % 4)).encode())
+
+
+def _sign(payload: str) -> str:
+    digest = hmac.new(
+        USER_SESSION_SECRET.encode(), payload.encode(), hashlib.sha256
+    ).digest()
+    return _b64encode(digest)
+
+
+def encode_session_token(user: User, generation: int) -> str:
+    now = datetime.utcnow()
+    token = SessionTokenSchema(
+        user=user.to_schema(),
+        issued_at=now,
+        expiration_at=now + timedelta(seconds=USER_SESSION_EXP),
+        generation=generation,
+    )
+    payload = _b64encode(token.model_dump_json().encode())
+    return f"{payload}.{_sign(payload)}"
+
+
+def decode_session_token(value: str) -> SessionTokenSchema | None:
+    payload, _, signature = value.partition(".")
+    if not hmac.compare_digest(signature.encode(), _sign(payload).encode()):
+        return None
+
+    try:
+        token = SessionTokenSchema.model_validate_json(_b64decode(payload))
+    except ValueError:
+        return None
+
+    if token.expiration_at <= datetime.utcnow():
+        return None
+    return token
@@ -0,0 +1,141 @@
+import gzip
+import hashlib
+import json
+import os
+import shutil
+from mimetypes import guess_type
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from app.core.compression import accepted_encodings
+from app.core.config import (
+    STATIC_BUILD_DIR,
+    STATIC_COMPRESS_LEVEL,
+    STATIC_DIR,
+    STATIC_IMMUTABLE_MAX_AGE,
+)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MANIFEST_NAME = "manifest.json"
+HASH_LENGTH = 8
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def fingerprint(path: str, content: bytes) -> str:
+    digest = hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+    root, ext = os.path.splitext(path)
+    return f"{root}.{digest}{ext}"
+
+
+def compress(path: str, content: bytes):
+    with open(path + ".gz", "wb") as file:
+        file.write(gzip.compress(content, STATIC_COMPRESS_LEVEL, mtime=0))
+    if brotli is not None:
+        with open(path + ".br", "wb") as file:
+            file.write(brotli.compress(content, quality=min(STATIC_COMPRESS_LEVEL, 11)))
+
+
+def build_assets(
+    source: str = STATIC_DIR, target: str = STATIC_BUILD_DIR
+) -> dict[str, str]:
+    shutil.rmtree(target, ignore_errors=True)
+    manifest = {}
+    for root, _, files in os.walk(source):
+        for name in files:
+            source_path = os.path.join(root, name)
+            path = os.path.relpath(source_path, source).replace(os.sep, "/")
+            with open(source_path, "rb") as file:
+                content = file.read()
+
+            manifest[path] = fingerprint(path, content)
+            for target_name in (path, manifest[path]):
+                target_path = os.path.join(target, target_name)
+                os.makedirs(os.path.dirname(target_path), exist_ok=True)
+                with open(target_path, "wb") as file:
+                    file.write(content)
+                compress(target_path, content)
+
+    with open(os.path.join(target, MANIFEST_NAME), "w") as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+    return manifest
+
+
+def load_manifest(directory: str = STATIC_BUILD_DIR) -> dict[str, str]:
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME)) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+
+manifest = load_manifest()
+manifest_version = hashlib.sha256(
+    json.dumps(manifest, sort_keys=True).encode()
+).hexdigest()[:HASH_LENGTH]
+
+
+def asset(path: str) -> str:
+    return manifest.get(path, path)
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    def __init__(self, *, directory: str, immutable: set[str] | None = None):
+        super().__init__(directory=directory)
+        self.immutable = immutable or set()
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        encodings = accepted_encodings(request_headers.get("accept-encoding", ""))
+
+        response = None
+        for encoding, suffix in ENCODINGS:
+            encoded_path = f"{full_path}{suffix}"
+            if encoding in encodings and os.path.isfile(encoded_path):
+                response = FileResponse(
+                    encoded_path,
+                    status_code=status_code,
+                    stat_result=os.stat(encoded_path),
+                    media_type=guess_type(full_path)[0] or "text/plain",
+                    headers={"Content-Encoding": encoding},
+                )
+                break
+        if response is None:
+            response = FileResponse(
+                full_path, status_code=status_code, stat_result=stat_result
+            )
+
+        response.headers["Vary"] = "Accept-Encoding"
+        path = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+        if path in self.immutable:
+            response.headers["Cache-Control"] = (
+                f"public, max-age={STATIC_IMMUTABLE_MAX_AGE}, immutable"
+            )
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def create_static_files() -> StaticFiles:
+    if manifest:
+        return PrecompressedStaticFiles(
+            directory=STATIC_BUILD_DIR, immutable=set(manifest.values())
+        )
+    return StaticFiles(directory=STATIC_DIR)
+
+
+if __name__ == "__main__":
+    print(f"Built {len(build_assets())} assets into {STATIC_BUILD_DIR}")
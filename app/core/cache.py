@@ -0,0 +1,275 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+from app.core.config import CACHE_BACKEND, CACHE_SIZE, CACHE_URL
+
+
+class TTLCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None):
+        expires_at = time.monotonic() + (self._ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._data),
+            "maxsize": self._maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class CacheBackend(ABC):
+    shared: bool = True
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float): ...
+
+    @abstractmethod
+    async def delete(self, *keys: str): ...
+
+    @abstractmethod
+    async def get_counter(self, key: str) -> int: ...
+
+    @abstractmethod
+    async def incr(self, key: str) -> int: ...
+
+    @abstractmethod
+    async def stats(self) -> dict[str, Any]: ...
+
+
+class MemoryCacheBackend(CacheBackend):
+    shared = False
+
+    def __init__(self, maxsize: int):
+        self._cache = TTLCache(maxsize, 0)
+        self._counters: dict[str, int] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        self._cache.set(key, value, ttl)
+
+    async def delete(self, *keys: str):
+        for key in keys:
+            self._cache.delete(key)
+
+    async def get_counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+    async def stats(self) -> dict[str, Any]:
+        return {"backend": "memory", **self._cache.stats()}
+
+
+class SqliteCacheBackend(CacheBackend):
+    def __init__(self, path: str, maxsize: int):
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=5
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS ix_cache_expires_at ON cache (expires_at)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS counters "
+            "(key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+        )
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _fetchone(self, sql: str, params: tuple = ()):
+        with self._lock:
+            return self._connection.execute(sql, params).fetchone()
+
+    def _set(self, key: str, value: bytes, ttl: float):
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) "
+                "VALUES (?, ?, ?)",
+                (key, value, time.time() + ttl),
+            )
+            (size,) = self._connection.execute("SELECT count(*) FROM cache").fetchone()
+            if size > self._maxsize:
+                self._connection.execute(
+                    "DELETE FROM cache WHERE key IN "
+                    "(SELECT key FROM cache ORDER BY expires_at LIMIT ?)",
+                    (size - self._maxsize,),
+                )
+                self.evictions += size - self._maxsize
+
+    def _delete(self, keys: tuple[str, ...]):
+        with self._lock:
+            self._connection.executemany(
+                "DELETE FROM cache WHERE key = ?", [(key,) for key in keys]
+            )
+
+    def _incr(self, key: str) -> int:
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.execute(
+                    "INSERT INTO counters (key, value) VALUES (?, 1) "
+                    "ON CONFLICT (key) DO UPDATE SET value = value + 1",
+                    (key,),
+                )
+                (value,) = self._connection.execute(
+                    "SELECT value FROM counters WHERE key = ?", (key,)
+                ).fetchone()
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            return value
+
+    async def get(self, key: str) -> bytes | None:
+        row = await asyncio.to_thread(
+            self._fetchone,
+            "SELECT value FROM cache WHERE key = ? AND expires_at > ?",
+            (key, time.time()),
+        )
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        await asyncio.to_thread(self._set, key, value, ttl)
+
+    async def delete(self, *keys: str):
+        await asyncio.to_thread(self._delete, keys)
+
+    async def get_counter(self, key: str) -> int:
+        row = await asyncio.to_thread(
+            self._fetchone, "SELECT value FROM counters WHERE key = ?", (key,)
+        )
+        return row[0] if row else 0
+
+    async def incr(self, key: str) -> int:
+        return await asyncio.to_thread(self._incr, key)
+
+    async def stats(self) -> dict[str, Any]:
+        (size,) = await asyncio.to_thread(self._fetchone, "SELECT count(*) FROM cache")
+        return {
+            "backend": "sqlite",
+            "size": size,
+            "maxsize": self._maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class RedisCacheBackend(CacheBackend):
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND=redis requires the redis package")
+
+        self._redis = redis.from_url(url)
+
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> bytes | None:
+        value = await self._redis.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        await self._redis.set(key, value, px=max(int(ttl * 1000), 1))
+
+    async def delete(self, *keys: str):
+        if keys:
+            await self._redis.delete(*keys)
+
+    async def get_counter(self, key: str) -> int:
+        return int(await self._redis.get(key) or 0)
+
+    async def incr(self, key: str) -> int:
+        return await self._redis.incr(key)
+
+    async def stats(self) -> dict[str, Any]:
+        info = await self._redis.info("stats")
+        return {
+            "backend": "redis",
+            "size": await self._redis.dbsize(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": info.get("evicted_keys", 0),
+        }
+
+
+def create_cache_backend() -> CacheBackend:
+    if CACHE_BACKEND == "memory":
+        return MemoryCacheBackend(CACHE_SIZE)
+    if CACHE_BACKEND == "sqlite":
+        return SqliteCacheBackend(CACHE_URL or "cache.sqlite3", CACHE_SIZE)
+    if CACHE_BACKEND == "redis":
+        return RedisCacheBackend(CACHE_URL or "redis://localhost:6379/0")
+    raise RuntimeError(f"Unknown CACHE_BACKEND: {CACHE_BACKEND}")
+
+
+cache = create_cache_backend()
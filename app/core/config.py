@@ -1,9 +1,12 @@
 import os
+from dataclasses import dataclass, fields, replace
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
+APP_ENV: str = os.environ.get("APP_ENV", "dev")
+
 DB_HOST: str = os.environ.get("POSTGRES_HOST")  # type: ignore
 DB_PORT: str = os.environ.get("POSTGRES_PORT")  # type: ignore
 DB_USER: str = os.environ.get("POSTGRES_USER")  # type: ignore
@@ -16,12 +19,139 @@ ASYNC_DATABASE_URL: str = (
 
 DATABASE_URL: str = f"postgresql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
+DB_REPLICA_HOST: str | None = os.environ.get("POSTGRES_REPLICA_HOST")
+DB_REPLICA_PORT: str = os.environ.get("POSTGRES_REPLICA_PORT", DB_PORT)
+
+ASYNC_REPLICA_DATABASE_URL: str | None = (
+    f"postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_REPLICA_HOST}:{DB_REPLICA_PORT}/{DB_NAME}"
+    if DB_REPLICA_HOST
+    else None
+)
+
+DB_PRIMARY_COOKIE_NAME: str = "X-DB-Primary"
+DB_REPLICA_STICKY_SECONDS: int = int(os.environ.get("DB_REPLICA_STICKY_SECONDS", 30))
+
+
+@dataclass(frozen=True)
+class EngineSettings:
+    echo: bool
+    pool_size: int
+    max_overflow: int
+    pool_timeout: float
+    pool_recycle: int
+    pool_pre_ping: bool
+    prepared_statement_cache_size: int
+
+    @classmethod
+    def from_env(cls, profile: str) -> "EngineSettings":
+        settings = ENGINE_PROFILES[profile]
+        for field in fields(cls):
+            value = os.environ.get(f"DB_{field.name.upper()}")
+            if value is None:
+                continue
+            if field.type is bool:
+                value = value.lower() in ("1", "true", "yes")
+            settings = replace(settings, **{field.name: field.type(value)})
+        return settings
+
+
+ENGINE_PROFILES: dict[str, EngineSettings] = {
+    "dev": EngineSettings(
+        echo=True,
+        pool_size=5,
+        max_overflow=10,
+        pool_timeout=30,
+        pool_recycle=-1,
+        pool_pre_ping=False,
+        prepared_statement_cache_size=100,
+    ),
+    "prod": EngineSettings(
+        echo=False,
+        pool_size=10,
+        max_overflow=5,
+        pool_timeout=10,
+        pool_recycle=1800,
+        pool_pre_ping=True,
+        prepared_statement_cache_size=500,
+    ),
+}
+
+ENGINE_SETTINGS: EngineSettings = EngineSettings.from_env(APP_ENV)
+
 USER_SESSION_COOKIE_NAME: str = os.environ.get("USER_SESSION_COOKIE_NAME")  # type: ignore
 USER_SESSION_EXP: int = int(os.environ.get("USER_SESSION_EXP"))  # type: ignore
 USER_SESSION_REFRESH: int = int(os.environ.get("USER_SESSION_REFRESH"))  # type: ignore
+USER_SESSION_MODE: str = os.environ.get("USER_SESSION_MODE", "db")
+USER_SESSION_SECRET: str | None = os.environ.get("USER_SESSION_SECRET")
+USER_SESSION_CACHE_TTL: int = int(os.environ.get("USER_SESSION_CACHE_TTL", 60))
 
 SALT_SIZE: int = int(os.environ.get("SALT_SIZE"))  # type: ignore
+PASSWORD_HASH_ALGORITHM: str = os.environ.get(
+    "PASSWORD_HASH_ALGORITHM", "pbkdf2_sha256"
+)
+PASSWORD_PBKDF2_ITERATIONS: int = int(
+    os.environ.get("PASSWORD_PBKDF2_ITERATIONS", 100000)
+)
+PASSWORD_SCRYPT_N: int = int(os.environ.get("PASSWORD_SCRYPT_N", 2**14))
+PASSWORD_SCRYPT_R: int = int(os.environ.get("PASSWORD_SCRYPT_R", 8))
+PASSWORD_SCRYPT_P: int = int(os.environ.get("PASSWORD_SCRYPT_P", 1))
+PASSWORD_HASH_WORKERS: int = int(os.environ.get("PASSWORD_HASH_WORKERS", 2))
+PASSWORD_HASH_QUEUE_SIZE: int = int(os.environ.get("PASSWORD_HASH_QUEUE_SIZE", 64))
+
+RECIPES_PAGE_SIZE: int = int(os.environ.get("RECIPES_PAGE_SIZE", 20))
+RECIPES_PAGE_SIZE_MAX: int = int(os.environ.get("RECIPES_PAGE_SIZE_MAX", 100))
+RECIPES_IMPORT_BATCH_SIZE: int = int(os.environ.get("RECIPES_IMPORT_BATCH_SIZE", 500))
+RECIPES_FAVORITES_BATCH_SIZE_MAX: int = int(
+    os.environ.get("RECIPES_FAVORITES_BATCH_SIZE_MAX", 100)
+)
+
+CACHE_BACKEND: str = os.environ.get("CACHE_BACKEND", "memory")
+CACHE_URL: str | None = os.environ.get("CACHE_URL")
+CACHE_SIZE: int = int(os.environ.get("CACHE_SIZE", 4096))
+
+RECIPES_CACHE_TTL: int = int(os.environ.get("RECIPES_CACHE_TTL", 60))
+RECIPES_HTTP_MAX_AGE: int = int(os.environ.get("RECIPES_HTTP_MAX_AGE", 60))
+RECIPES_HTTP_STALE_WHILE_REVALIDATE: int = int(
+    os.environ.get("RECIPES_HTTP_STALE_WHILE_REVALIDATE", 300)
+)
+
+RECIPES_TRENDING_HALF_LIFE_HOURS: float = float(
+    os.environ.get("RECIPES_TRENDING_HALF_LIFE_HOURS", 24)
+)
+RECIPES_TRENDING_VIEW_WEIGHT: float = float(
+    os.environ.get("RECIPES_TRENDING_VIEW_WEIGHT", 1)
+)
+RECIPES_TRENDING_FAVORITE_WEIGHT: float = float(
+    os.environ.get("RECIPES_TRENDING_FAVORITE_WEIGHT", 10)
+)
+RECIPES_TRENDING_CREATED_WEIGHT: float = float(
+    os.environ.get("RECIPES_TRENDING_CREATED_WEIGHT", 10)
+)
+RECIPES_SCORES_FLUSH_INTERVAL: float = float(
+    os.environ.get("RECIPES_SCORES_FLUSH_INTERVAL", 30)
+)
+RECIPES_PANTRY_REBUILD_INTERVAL: float = float(
+    os.environ.get("RECIPES_PANTRY_REBUILD_INTERVAL", 10)
+)
+
+TEMPLATES_DIR: str = os.environ.get("TEMPLATES_DIR", "app/templates")
+TEMPLATES_AUTO_RELOAD: bool = os.environ.get(
+    "TEMPLATES_AUTO_RELOAD", str(APP_ENV != "prod")
+).lower() in ("1", "true", "yes")
+TEMPLATES_BYTECODE_CACHE_DIR: str | None = (
+    os.environ.get("TEMPLATES_BYTECODE_CACHE_DIR", ".jinja_cache") or None
+)
+
+STATIC_DIR: str = os.environ.get("STATIC_DIR", "app/static")
+STATIC_BUILD_DIR: str = os.environ.get("STATIC_BUILD_DIR", "app/static_build")
+STATIC_COMPRESS_LEVEL: int = int(os.environ.get("STATIC_COMPRESS_LEVEL", 9))
+STATIC_IMMUTABLE_MAX_AGE: int = int(
+    os.environ.get("STATIC_IMMUTABLE_MAX_AGE", 60 * 60 * 24 * 365)
+)
 
+COMPRESSION_MINIMUM_SIZE: int = int(os.environ.get("COMPRESSION_MINIMUM_SIZE", 500))
+COMPRESSION_GZIP_LEVEL: int = int(os.environ.get("COMPRESSION_GZIP_LEVEL", 6))
+COMPRESSION_BROTLI_QUALITY: int = int(os.environ.get("COMPRESSION_BROTLI_QUALITY", 4))
 
 ADMIN_USERNAME = os.environ.get("ADMIN_USERNAME")  # type: ignore
 ADMIN_PASSWORD = os.environ.get("ADMIN_PASSWORD")  # type: ignore
@@ -1,15 +1,151 @@
+import time
 from typing import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Depends, Request, Response
+from sqlalchemy import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.config import (
+    ASYNC_DATABASE_URL,
+    ASYNC_REPLICA_DATABASE_URL,
+    DB_PRIMARY_COOKIE_NAME,
+    DB_REPLICA_STICKY_SECONDS,
+    ENGINE_SETTINGS,
+)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    def __init__(self, *args, max_overflow: int = 10, **kwargs):
+        super().__init__(*args, max_overflow=max_overflow, **kwargs)
+        self.max_overflow = max_overflow
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def _will_wait(self) -> bool:
+        return (
+            self.checkedin() == 0
+            and self.max_overflow > -1
+            and self.overflow() >= self.max_overflow
+        )
+
+    def _do_get(self):
+        self.checkouts += 1
+        if not self._will_wait():
+            return super()._do_get()
 
-from app.core.config import ASYNC_DATABASE_URL
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            wait_time = time.perf_counter() - started_at
+            self.waits += 1
+            self.wait_time_total += wait_time
+            self.wait_time_max = max(self.wait_time_max, wait_time)
 
-async_engine = create_async_engine(ASYNC_DATABASE_URL, echo=True)
+    def stats(self) -> dict[str, float]:
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            "max_overflow": self.max_overflow,
+            "checkouts": self.checkouts,
+            "waits": self.waits,
+            "wait_time_total": self.wait_time_total,
+            "wait_time_max": self.wait_time_max,
+        }
+
+
+def create_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        make_url(url).update_query_dict(
+            {
+                "prepared_statement_cache_size": str(
+                    ENGINE_SETTINGS.prepared_statement_cache_size
+                )
+            }
+        ),
+        echo=ENGINE_SETTINGS.echo,
+        poolclass=TimedQueuePool,
+        pool_size=ENGINE_SETTINGS.pool_size,
+        max_overflow=ENGINE_SETTINGS.max_overflow,
+        pool_timeout=ENGINE_SETTINGS.pool_timeout,
+        pool_recycle=ENGINE_SETTINGS.pool_recycle,
+        pool_pre_ping=ENGINE_SETTINGS.pool_pre_ping,
+    )
+
+
+async_engine = create_engine(ASYNC_DATABASE_URL)
 async_session_maker = async_sessionmaker(
     async_engine, expire_on_commit=False, class_=AsyncSession
 )
 
+async_replica_engine = (
+    create_engine(ASYNC_REPLICA_DATABASE_URL) if ASYNC_REPLICA_DATABASE_URL else None
+)
+async_replica_session_maker = (
+    async_sessionmaker(
+        async_replica_engine, expire_on_commit=False, class_=AsyncSession
+    )
+    if async_replica_engine
+    else None
+)
+async_read_session_maker = async_replica_session_maker or async_session_maker
+
+
+def is_replica_session(db_session: AsyncSession) -> bool:
+    return async_replica_engine is not None and db_session.bind is async_replica_engine
+
+
+def is_sticky_primary_session(db_session: AsyncSession) -> bool:
+    return async_replica_engine is not None and db_session.bind is async_engine
+
+
+def pool_stats() -> dict[str, dict[str, float]]:
+    stats = {"primary": async_engine.sync_engine.pool.stats()}  # type: ignore
+    if async_replica_engine is not None:
+        stats["replica"] = async_replica_engine.sync_engine.pool.stats()  # type: ignore
+    return stats
+
 
 async def async_db_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_maker() as session:
         yield session
+
+
+async def async_db_write_session(
+    response: Response,
+    db_session: AsyncSession = Depends(async_db_session),
+) -> AsyncSession:
+    if async_replica_session_maker is not None:
+        response.set_cookie(
+            DB_PRIMARY_COOKIE_NAME,
+            "1",
+            max_age=DB_REPLICA_STICKY_SECONDS,
+            path="/",
+            httponly=True,
+            samesite="strict",
+        )
+    return db_session
+
+
+async def async_db_read_session(
+    request: Request,
+    db_session: AsyncSession = Depends(async_db_session),
+) -> AsyncGenerator[AsyncSession, None]:
+    if async_replica_session_maker is None or request.cookies.get(
+        DB_PRIMARY_COOKIE_NAME
+    ):
+        yield db_session
+        return
+
+    async with async_replica_session_maker() as session:
+        yield session
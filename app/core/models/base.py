@@ -1,3 +1,5 @@
+from typing import Any, Mapping, Self
+
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy.orm import DeclarativeBase
 
@@ -5,6 +7,10 @@ from sqlalchemy.orm import DeclarativeBase
 class BaseSchema(BaseModel):
     model_config = ConfigDict(str_strip_whitespace=True)
 
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any], **additional) -> Self:
+        return cls.model_construct(**row, **additional)
+
 
 class BaseORM[Schema: BaseSchema](DeclarativeBase):
     _schema: type[Schema]
@@ -21,3 +27,15 @@ class BaseORM[Schema: BaseSchema](DeclarativeBase):
             setattr(self, k, v)
 
         return schema.model_validate(self, from_attributes=True)
+
+    def construct_schema(self, schema: type[BaseSchema] | None = None, **additional):
+        schema = schema or self._schema
+        assert schema, "Схема не определена"
+
+        return schema.model_construct(
+            **{
+                name: additional[name] if name in additional else getattr(self, name)
+                for name in schema.model_fields
+                if name in additional or hasattr(self, name)
+            }
+        )
@@ -1,9 +1,12 @@
+from datetime import datetime
 from uuid import UUID, uuid4
 
-from sqlalchemy import ForeignKey
-from sqlalchemy.dialects.postgresql import JSONB
+from pydantic import Field
+from sqlalchemy import Computed, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.core.config import RECIPES_FAVORITES_BATCH_SIZE_MAX
 from app.core.models.base import BaseORM, BaseSchema
 
 
@@ -18,14 +21,99 @@ class CreateRecipeSchema(BaseSchema):
 
 class RecipeSchema(CreateRecipeSchema):
     recipe_id: UUID
+    version: int = 1
+    updated_at: datetime | None = None
+    favorite_count: int = 0
     is_favorite: bool = False
 
 
+class RecipeSummarySchema(BaseSchema):
+    recipe_id: UUID
+    name: str
+    description: str
+    image_link: str
+    is_favorite: bool = False
+
+
+class PantryMatchSchema(RecipeSummarySchema):
+    matched: int
+    missing: list[str]
+
+
+class RecipePageSchema[Item: BaseSchema](BaseSchema):
+    items: list[Item]
+    next_cursor: str | None = None
+
+
+class FacetSchema(BaseSchema):
+    name: str
+    count: int
+
+
+class RecipeFacetsSchema(BaseSchema):
+    tags: list[FacetSchema]
+    ingredients: list[FacetSchema]
+
+
+class FavoritesBatchSchema(BaseSchema):
+    add: list[UUID] = Field([], max_length=RECIPES_FAVORITES_BATCH_SIZE_MAX)
+    remove: list[UUID] = Field([], max_length=RECIPES_FAVORITES_BATCH_SIZE_MAX)
+
+
+class FavoritesBatchResultSchema(BaseSchema):
+    added: list[UUID]
+    removed: list[UUID]
+
+
+class ImportErrorSchema(BaseSchema):
+    line: int
+    error: str
+
+
+class ImportResultSchema(BaseSchema):
+    rows: int
+    imported: int
+    invalid: int
+    errors: list[ImportErrorSchema]
+    seconds: float
+    rows_per_second: float
+
+
 class Recipe(BaseORM):
     __tablename__ = "recipes"
+    __table_args__ = (
+        Index("ix_recipes_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_recipes_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_recipes_tags",
+            "tags",
+            postgresql_using="gin",
+            postgresql_ops={"tags": "jsonb_path_ops"},
+        ),
+        Index(
+            "ix_recipes_ingredients",
+            "ingredients",
+            postgresql_using="gin",
+            postgresql_ops={"ingredients": "jsonb_ops"},
+        ),
+        Index("ix_recipes_favorite_count", "favorite_count", "recipe_id"),
+        Index("ix_recipes_created_at", "created_at", "recipe_id"),
+    )
     _schema = RecipeSchema
 
     recipe_id: Mapped[UUID] = mapped_column(default=uuid4, primary_key=True)
+    version: Mapped[int] = mapped_column(nullable=False, server_default="1")
+    created_at: Mapped[datetime] = mapped_column(
+        nullable=False, default=datetime.utcnow
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
     name: Mapped[str] = mapped_column(unique=True)
     description: Mapped[str] = mapped_column()
     action_to_cook: Mapped[str] = mapped_column()
@@ -35,6 +123,35 @@ class Recipe(BaseORM):
 
     ingredients: Mapped[dict[str, str]] = mapped_column(JSONB, default=dict)
     tags: Mapped[list] = mapped_column(JSONB, default=list)
+    favorite_count: Mapped[int] = mapped_column(
+        nullable=False, default=0, server_default="0"
+    )
+
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('russian'::regconfig, name), 'A') || "
+            "setweight(to_tsvector('russian'::regconfig, description), 'B') || "
+            "setweight(to_tsvector('russian'::regconfig, action_to_cook), 'C')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+
+    __mapper_args__ = {"version_id_col": version}
+
+
+class RecipeScore(BaseORM):
+    __tablename__ = "recipe_scores"
+    __table_args__ = (Index("ix_recipe_scores_trending", "trending", "recipe_id"),)
+
+    recipe_id: Mapped[UUID] = mapped_column(
+        ForeignKey("recipes.recipe_id", ondelete="CASCADE"), primary_key=True
+    )
+    trending: Mapped[float] = mapped_column(nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        nullable=False, default=datetime.utcnow
+    )
 
 
 class Image(BaseORM):
@@ -53,3 +170,43 @@ class UserFavorite(BaseORM):
         ForeignKey("recipes.recipe_id"), primary_key=True
     )
     user_id: Mapped[UUID] = mapped_column(ForeignKey("users.user_id"), primary_key=True)
+
+
+class Tag(BaseORM):
+    __tablename__ = "tags"
+
+    tag_id: Mapped[UUID] = mapped_column(default=uuid4, primary_key=True)
+    name: Mapped[str] = mapped_column(unique=True)
+
+
+class Ingredient(BaseORM):
+    __tablename__ = "ingredients"
+
+    ingredient_id: Mapped[UUID] = mapped_column(default=uuid4, primary_key=True)
+    name: Mapped[str] = mapped_column(unique=True)
+
+
+class RecipeTag(BaseORM):
+    __tablename__ = "recipe_tags"
+    __table_args__ = (Index("ix_recipe_tags_tag_id", "tag_id", "recipe_id"),)
+
+    recipe_id: Mapped[UUID] = mapped_column(
+        ForeignKey("recipes.recipe_id", ondelete="CASCADE"), primary_key=True
+    )
+    tag_id: Mapped[UUID] = mapped_column(
+        ForeignKey("tags.tag_id", ondelete="CASCADE"), primary_key=True
+    )
+
+
+class RecipeIngredient(BaseORM):
+    __tablename__ = "recipe_ingredients"
+    __table_args__ = (
+        Index("ix_recipe_ingredients_ingredient_id", "ingredient_id", "recipe_id"),
+    )
+
+    recipe_id: Mapped[UUID] = mapped_column(
+        ForeignKey("recipes.recipe_id", ondelete="CASCADE"), primary_key=True
+    )
+    ingredient_id: Mapped[UUID] = mapped_column(
+        ForeignKey("ingredients.ingredient_id", ondelete="CASCADE"), primary_key=True
+    )
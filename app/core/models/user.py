@@ -23,6 +23,20 @@ class UserSchema(BaseSchema):
     role: Role
 
 
+class UserSessionSchema(BaseSchema):
+    session_id: UUID
+    expiration_at: datetime
+    created_at: datetime
+    user: UserSchema
+
+
+class SessionTokenSchema(BaseSchema):
+    user: UserSchema
+    issued_at: datetime
+    expiration_at: datetime
+    generation: int
+
+
 class User(BaseORM):
     __tablename__ = "users"
     _schema = UserSchema
@@ -35,6 +49,7 @@ class User(BaseORM):
     role: Mapped[Role] = mapped_column(
         SQLEnum(Role, name="enum_user_roles"), nullable=False, default=Role.USER
     )
+    session_generation: Mapped[int] = mapped_column(nullable=False, server_default="0")
 
     session: Mapped["UserSession"] = relationship("UserSession", back_populates="user")
 
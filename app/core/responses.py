@@ -0,0 +1,80 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any
+
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+def _default(value: Any):
+    if isinstance(value, BaseModel):
+        return value.__pydantic_serializer__.to_python(value, mode="json")
+    raise TypeError
+
+
+def dumps(value: Any) -> bytes:
+    if isinstance(value, BaseModel):
+        return value.__pydantic_serializer__.to_json(value)
+    return orjson.dumps(value, default=_default)
+
+
+class JSONBytesResponse(ORJSONResponse):
+    def render(self, content: Any) -> bytes:
+        return content if isinstance(content, bytes) else dumps(content)
+
+
+def with_cookies(response: Response, sub_response: Response) -> Response:
+    for value in sub_response.headers.getlist("set-cookie"):
+        response.headers.append("set-cookie", value)
+    return response
+
+
+def json_response(content: Any, sub_response: Response) -> Response:
+    return with_cookies(JSONBytesResponse(content), sub_response)
+
+
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.sha1(
+        b":".join(
+            part if isinstance(part, bytes) else str(part).encode() for part in parts
+        )
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def cache_headers(
+    etag: str, cache_control: str, last_modified: datetime | None = None
+) -> dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(
+            last_modified.replace(tzinfo=last_modified.tzinfo or timezone.utc),
+            usegmt=True,
+        )
+    return headers
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in tags or etag in tags
+
+
+def not_modified_response(headers: dict[str, str], sub_response: Response) -> Response:
+    return with_cookies(Response(status_code=304, headers=headers), sub_response)
+
+
+def cached_json_response(
+    request: Request,
+    content: Any,
+    sub_response: Response,
+    headers: dict[str, str],
+) -> Response:
+    if etag_matches(request, headers["ETag"]):
+        return not_modified_response(headers, sub_response)
+    return with_cookies(JSONBytesResponse(content, headers=headers), sub_response)
@@ -0,0 +1,44 @@
+import logging
+import os
+import time
+
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from app.core.assets import asset
+from app.core.config import (
+    TEMPLATES_AUTO_RELOAD,
+    TEMPLATES_BYTECODE_CACHE_DIR,
+    TEMPLATES_DIR,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def create_bytecode_cache() -> FileSystemBytecodeCache | None:
+    if TEMPLATES_BYTECODE_CACHE_DIR is None:
+        return None
+    os.makedirs(TEMPLATES_BYTECODE_CACHE_DIR, exist_ok=True)
+    return FileSystemBytecodeCache(TEMPLATES_BYTECODE_CACHE_DIR)
+
+
+templates = Jinja2Templates(
+    env=Environment(
+        loader=FileSystemLoader(TEMPLATES_DIR),
+        autoescape=True,
+        auto_reload=TEMPLATES_AUTO_RELOAD,
+        bytecode_cache=create_bytecode_cache(),
+        cache_size=-1,
+    )
+)
+templates.env.globals["asset"] = asset
+
+
+def warm_up_templates() -> dict[str, float]:
+    started_at = time.perf_counter()
+    names = templates.env.list_templates(extensions=["html"])
+    for name in names:
+        templates.get_template(name)
+    stats = {"templates": len(names), "seconds": time.perf_counter() - started_at}
+    logger.info("Compiled %(templates)d templates in %(seconds).3fs", stats)
+    return stats
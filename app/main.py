@@ -1,17 +1,37 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import APIRouter, FastAPI
-from fastapi.staticfiles import StaticFiles
 
 from app.auth.api_routers import api_auth_router
+from app.core.assets import create_static_files
+from app.core.compression import CompressionMiddleware
+from app.core.templates import warm_up_templates
+from app.metrics.api_routers import api_metrics_router
 from app.recipes.api_routers import api_recipes_router
+from app.recipes.ranking import run_scores_job
 from app.recipes.view_routers import view_recipes_router
 
-app = FastAPI()
 
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warm_up_templates()
+    scores_job = asyncio.create_task(run_scores_job())
+    yield
+    scores_job.cancel()
+    with suppress(asyncio.CancelledError):
+        await scores_job
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(CompressionMiddleware)
+
+app.mount("/static", create_static_files(), name="static")
 
 api_v1 = APIRouter(prefix="/api/v1")
 api_v1.include_router(api_auth_router)
 api_v1.include_router(api_recipes_router)
+api_v1.include_router(api_metrics_router)
 
 app.include_router(api_v1)
 app.include_router(view_recipes_router)
@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends
+
+from app.auth.helpers import current_admin
+from app.auth.passwords import password_hasher
+from app.core.cache import cache
+from app.core.database import pool_stats
+from app.core.models.user import User
+from app.recipes.cache import html_cache_stats
+from app.recipes.pantry import pantry_index_stats
+
+api_metrics_router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@api_metrics_router.get("/cache")
+async def api_cache_metrics(
+    admin: User = Depends(current_admin),
+):
+    return await cache.stats()
+
+
+@api_metrics_router.get("/password-hasher")
+async def api_password_hasher_metrics(
+    admin: User = Depends(current_admin),
+):
+    return password_hasher.stats()
+
+
+@api_metrics_router.get("/db-pool")
+async def api_db_pool_metrics(
+    admin: User = Depends(current_admin),
+):
+    return pool_stats()
+
+
+@api_metrics_router.get("/html-cache")
+async def api_html_cache_metrics(
+    admin: User = Depends(current_admin),
+):
+    return html_cache_stats()
+
+
+@api_metrics_router.get("/pantry-index")
+async def api_pantry_index_metrics(
+    admin: User = Depends(current_admin),
+):
+    return pantry_index_stats()
@@ -12,7 +12,7 @@ from uuid import uuid4
 
 from alembic import op
 
-from app.auth.helpers import hash_raw_password
+from app.auth.passwords import hash_raw_password
 from app.core.config import ADMIN_EMAIL, ADMIN_PASSWORD, ADMIN_USERNAME
 from app.core.models.user import User
 
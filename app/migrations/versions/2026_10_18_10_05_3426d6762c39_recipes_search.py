@@ -0,0 +1,56 @@
+"""recipes search
+
+Revision ID: 3426d6762c39
+Revises: 4abbaeeb124e
+Create Date: 2026-10-18 10:05:12.418301
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "3426d6762c39"
+down_revision: Union[str, None] = "4abbaeeb124e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column(
+        "recipes",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('russian'::regconfig, name), 'A') || "
+                "setweight(to_tsvector('russian'::regconfig, description), 'B') || "
+                "setweight(to_tsvector('russian'::regconfig, action_to_cook), 'C')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_recipes_search_vector",
+        "recipes",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix_recipes_name_trgm",
+        "recipes",
+        ["name"],
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_recipes_name_trgm", table_name="recipes")
+    op.drop_index("ix_recipes_search_vector", table_name="recipes")
+    op.drop_column("recipes", "search_vector")
@@ -0,0 +1,39 @@
+"""recipes jsonb indexes
+
+Revision ID: d282ae96fe55
+Revises: 3426d6762c39
+Create Date: 2026-10-18 10:40:37.902114
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d282ae96fe55"
+down_revision: Union[str, None] = "3426d6762c39"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_recipes_tags",
+        "recipes",
+        ["tags"],
+        postgresql_using="gin",
+        postgresql_ops={"tags": "jsonb_path_ops"},
+    )
+    op.create_index(
+        "ix_recipes_ingredients",
+        "recipes",
+        ["ingredients"],
+        postgresql_using="gin",
+        postgresql_ops={"ingredients": "jsonb_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_recipes_ingredients", table_name="recipes")
+    op.drop_index("ix_recipes_tags", table_name="recipes")
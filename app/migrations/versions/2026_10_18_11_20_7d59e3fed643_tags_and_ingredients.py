@@ -0,0 +1,107 @@
+"""tags and ingredients
+
+Revision ID: 7d59e3fed643
+Revises: d282ae96fe55
+Create Date: 2026-10-18 11:20:44.106527
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7d59e3fed643"
+down_revision: Union[str, None] = "d282ae96fe55"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tags",
+        sa.Column("tag_id", sa.Uuid(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint("tag_id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.create_table(
+        "ingredients",
+        sa.Column("ingredient_id", sa.Uuid(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint("ingredient_id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.create_table(
+        "recipe_tags",
+        sa.Column("recipe_id", sa.Uuid(), nullable=False),
+        sa.Column("tag_id", sa.Uuid(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["recipe_id"], ["recipes.recipe_id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(["tag_id"], ["tags.tag_id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("recipe_id", "tag_id"),
+    )
+    op.create_index("ix_recipe_tags_tag_id", "recipe_tags", ["tag_id", "recipe_id"])
+    op.create_table(
+        "recipe_ingredients",
+        sa.Column("recipe_id", sa.Uuid(), nullable=False),
+        sa.Column("ingredient_id", sa.Uuid(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["recipe_id"], ["recipes.recipe_id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["ingredient_id"], ["ingredients.ingredient_id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("recipe_id", "ingredient_id"),
+    )
+    op.create_index(
+        "ix_recipe_ingredients_ingredient_id",
+        "recipe_ingredients",
+        ["ingredient_id", "recipe_id"],
+    )
+
+    op.execute(
+        """
+        INSERT INTO tags (tag_id, name)
+        SELECT gen_random_uuid(), name
+        FROM (SELECT DISTINCT jsonb_array_elements_text(tags) AS name FROM recipes) t
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO recipe_tags (recipe_id, tag_id)
+        SELECT DISTINCT r.recipe_id, t.tag_id
+        FROM recipes r
+        CROSS JOIN LATERAL jsonb_array_elements_text(r.tags) AS e(name)
+        JOIN tags t ON t.name = e.name
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO ingredients (ingredient_id, name)
+        SELECT gen_random_uuid(), name
+        FROM (SELECT DISTINCT jsonb_object_keys(ingredients) AS name FROM recipes) i
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO recipe_ingredients (recipe_id, ingredient_id)
+        SELECT r.recipe_id, i.ingredient_id
+        FROM recipes r
+        CROSS JOIN LATERAL jsonb_object_keys(r.ingredients) AS e(name)
+        JOIN ingredients i ON i.name = e.name
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_recipe_ingredients_ingredient_id", table_name="recipe_ingredients"
+    )
+    op.drop_table("recipe_ingredients")
+    op.drop_index("ix_recipe_tags_tag_id", table_name="recipe_tags")
+    op.drop_table("recipe_tags")
+    op.drop_table("ingredients")
+    op.drop_table("tags")
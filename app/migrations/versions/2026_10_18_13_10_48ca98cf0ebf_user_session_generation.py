@@ -0,0 +1,31 @@
+"""user session generation
+
+Revision ID: 48ca98cf0ebf
+Revises: 7d59e3fed643
+Create Date: 2026-10-18 13:10:21.550814
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "48ca98cf0ebf"
+down_revision: Union[str, None] = "7d59e3fed643"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column(
+            "session_generation", sa.Integer(), server_default="0", nullable=False
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "session_generation")
@@ -0,0 +1,45 @@
+"""images image_link unique
+
+Revision ID: 5f76b4a98074
+Revises: 48ca98cf0ebf
+Create Date: 2026-10-18 14:00:12.184306
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5f76b4a98074"
+down_revision: Union[str, None] = "48ca98cf0ebf"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        UPDATE recipes r
+        SET image_id = s.image_id
+        FROM images i
+        JOIN (
+            SELECT DISTINCT ON (image_link) image_link, image_id
+            FROM images
+            ORDER BY image_link, image_id
+        ) s ON s.image_link = i.image_link
+        WHERE r.image_id = i.image_id AND i.image_id <> s.image_id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM images i
+        USING images s
+        WHERE s.image_link = i.image_link AND s.image_id < i.image_id
+        """
+    )
+    op.create_unique_constraint("images_image_link_key", "images", ["image_link"])
+
+
+def downgrade() -> None:
+    op.drop_constraint("images_image_link_key", "images", type_="unique")
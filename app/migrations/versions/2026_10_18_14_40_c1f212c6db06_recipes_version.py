@@ -0,0 +1,40 @@
+"""recipes version
+
+Revision ID: c1f212c6db06
+Revises: 5f76b4a98074
+Create Date: 2026-10-18 14:40:08.402715
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c1f212c6db06"
+down_revision: Union[str, None] = "5f76b4a98074"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "recipes",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+    op.add_column(
+        "recipes",
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.text("(now() at time zone 'utc')"),
+            nullable=False,
+        ),
+    )
+    op.alter_column("recipes", "updated_at", server_default=None)
+
+
+def downgrade() -> None:
+    op.drop_column("recipes", "updated_at")
+    op.drop_column("recipes", "version")
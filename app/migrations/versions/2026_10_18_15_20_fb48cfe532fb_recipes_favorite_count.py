@@ -0,0 +1,45 @@
+"""recipes favorite count
+
+Revision ID: fb48cfe532fb
+Revises: c1f212c6db06
+Create Date: 2026-10-18 15:20:44.918230
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "fb48cfe532fb"
+down_revision: Union[str, None] = "c1f212c6db06"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "recipes",
+        sa.Column("favorite_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.execute(
+        """
+        UPDATE recipes
+        SET favorite_count = counts.count
+        FROM (
+            SELECT recipe_id, count(*) AS count
+            FROM user_favorites
+            GROUP BY recipe_id
+        ) AS counts
+        WHERE recipes.recipe_id = counts.recipe_id
+        """
+    )
+    op.create_index(
+        "ix_recipes_favorite_count", "recipes", ["favorite_count", "recipe_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_recipes_favorite_count", table_name="recipes")
+    op.drop_column("recipes", "favorite_count")
@@ -0,0 +1,65 @@
+"""recipe scores
+
+Revision ID: 388144654dbe
+Revises: fb48cfe532fb
+Create Date: 2026-10-18 16:00:31.207563
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "388144654dbe"
+down_revision: Union[str, None] = "fb48cfe532fb"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "recipes",
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("(now() at time zone 'utc')"),
+            nullable=False,
+        ),
+    )
+    op.alter_column("recipes", "created_at", server_default=None)
+    op.create_index("ix_recipes_created_at", "recipes", ["created_at", "recipe_id"])
+
+    op.create_table(
+        "recipe_scores",
+        sa.Column("recipe_id", sa.Uuid(), nullable=False),
+        sa.Column("trending", sa.Float(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["recipe_id"], ["recipes.recipe_id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("recipe_id"),
+    )
+    op.create_index(
+        "ix_recipe_scores_trending", "recipe_scores", ["trending", "recipe_id"]
+    )
+    op.execute(
+        """
+        INSERT INTO recipe_scores (recipe_id, trending, updated_at)
+        SELECT
+            recipe_id,
+            ln(10 * favorite_count + 1)
+                + extract(epoch FROM now() - timestamptz '2024-01-01 00:00:00+00')
+                / (24 * 3600 / ln(2)),
+            now() at time zone 'utc'
+        FROM recipes
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_recipe_scores_trending", table_name="recipe_scores")
+    op.drop_table("recipe_scores")
+    op.drop_index("ix_recipes_created_at", table_name="recipes")
+    op.drop_column("recipes", "created_at")
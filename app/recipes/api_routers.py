@@ -1,24 +1,78 @@
 from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import and_, func, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.exc import StaleDataError
 
 from app.auth.helpers import (
     current_admin,
     current_user,
     current_user_or_none,
 )
-from app.core.database import async_db_session
+from app.core.config import RECIPES_PAGE_SIZE, RECIPES_PAGE_SIZE_MAX
+from app.core.database import (
+    async_db_read_session,
+    async_db_write_session,
+    async_read_session_maker,
+)
+from app.core.models.base import BaseSchema
 from app.core.models.recipe import (
     CreateRecipeSchema,
+    FavoritesBatchResultSchema,
+    FavoritesBatchSchema,
     Image,
+    ImportResultSchema,
+    PantryMatchSchema,
     Recipe,
+    RecipeFacetsSchema,
+    RecipePageSchema,
     RecipeSchema,
-    UserFavorite,
 )
 from app.core.models.user import User
+from app.core.responses import (
+    cached_json_response,
+    dumps,
+    etag_matches,
+    json_response,
+    make_etag,
+    not_modified_response,
+    with_cookies,
+)
+from app.recipes.bulk import (
+    EXPORT_MEDIA_TYPES,
+    BulkFormat,
+    export_recipes,
+    import_recipes,
+)
+from app.recipes.cache import (
+    PRIVATE_CACHE_CONTROL,
+    PUBLIC_CACHE_CONTROL,
+    invalidate_favorites,
+    invalidate_recipe,
+    recipe_cache_headers,
+    recipe_page_cache_headers,
+    recipe_page_key,
+)
+from app.recipes.facets import (
+    count_ingredient_facets,
+    count_tag_facets,
+    sync_recipe_terms,
+)
+from app.recipes.fields import recipe_fields
+from app.recipes.pantry import match_pantry
+from app.recipes.ranking import record_created, record_views
+from app.recipes.search import RecipeFilters
+from app.recipes.services import (
+    STREAM_MEDIA_TYPES,
+    StreamFormat,
+    get_favorites,
+    get_recipe,
+    get_recipes_page,
+    stream_recipes,
+    update_favorites,
+)
 
 api_recipes_router = APIRouter(prefix="/recipes", tags=["recipes"])
 
@@ -27,7 +81,7 @@ api_recipes_router = APIRouter(prefix="/recipes", tags=["recipes"])
 async def api_create_recipe(
     recipe_schema: CreateRecipeSchema,
     admin: User = Depends(current_admin),
-    db_session: AsyncSession = Depends(async_db_session),
+    db_session: AsyncSession = Depends(async_db_write_session),
 ):
     recipe = await db_session.scalar(
         select(Recipe.recipe_id).where(Recipe.name == recipe_schema.name)
@@ -53,7 +107,11 @@ async def api_create_recipe(
     )
 
     db_session.add(recipe)
+    await db_session.flush()
+    await sync_recipe_terms(db_session, recipe)
     await db_session.commit()
+    await invalidate_recipe()
+    record_created(recipe.recipe_id)
 
     return recipe.to_schema(image_link=recipe_schema.image_link)
 
@@ -63,7 +121,7 @@ async def api_update_recipe(
     recipe_id: UUID,
     recipe_schema: CreateRecipeSchema,
     admin: User = Depends(current_admin),
-    db_session: AsyncSession = Depends(async_db_session),
+    db_session: AsyncSession = Depends(async_db_write_session),
 ):
     recipe = await db_session.get(Recipe, recipe_id)
     if recipe is None:
@@ -77,6 +135,7 @@ async def api_update_recipe(
         image = Image(image_id=image_id, image_link=recipe_schema.image_link)
         db_session.add(image)
 
+    ingredients_changed = set(recipe.ingredients) != set(recipe_schema.ingredients)
     recipe.image_id = image_id
     recipe.name = recipe_schema.name
     recipe.description = recipe_schema.description
@@ -84,118 +143,188 @@ async def api_update_recipe(
     recipe.ingredients = recipe_schema.ingredients
     recipe.tags = recipe_schema.tags
 
-    await db_session.commit()
+    try:
+        await sync_recipe_terms(db_session, recipe)
+        await db_session.commit()
+    except StaleDataError:
+        raise HTTPException(409, "Recipe was modified concurrently")
+    await invalidate_recipe(recipe_id, ingredients=ingredients_changed)
 
     return recipe.to_schema(image_link=recipe_schema.image_link)
 
 
-@api_recipes_router.get("/", response_model=list[RecipeSchema])
+@api_recipes_router.post("/import", response_model=ImportResultSchema)
+async def api_import_recipes(
+    request: Request,
+    format: BulkFormat = Query("ndjson"),
+    admin: User = Depends(current_admin),
+    db_session: AsyncSession = Depends(async_db_write_session),
+):
+    return await import_recipes(db_session, request.stream(), format)
+
+
+@api_recipes_router.get("/export")
+async def api_export_recipes(
+    format: BulkFormat = Query("ndjson"),
+    admin: User = Depends(current_admin),
+):
+    async def content():
+        async with async_read_session_maker() as db_session:
+            async for chunk in export_recipes(db_session, format):
+                yield chunk
+
+    return StreamingResponse(
+        content(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="recipes.{format}"'},
+    )
+
+
+@api_recipes_router.get("/", response_model=RecipePageSchema[RecipeSchema])
 async def api_get_recipes(
-    name: str | None = Query(None),
-    tags: list[str] | None = Query(None),
-    ingredients: list[str] | None = Query(None),
+    request: Request,
+    response: Response,
+    filters: RecipeFilters = Depends(),
+    schema: type[BaseSchema] = Depends(recipe_fields),
+    cursor: str | None = Query(None),
+    limit: int = Query(RECIPES_PAGE_SIZE, ge=1, le=RECIPES_PAGE_SIZE_MAX),
     user: User | None = Depends(current_user_or_none),
-    db_session: AsyncSession = Depends(async_db_session),
+    db_session: AsyncSession = Depends(async_db_read_session),
 ):
-    query = select(Recipe).options(joinedload(Recipe.image).load_only(Image.image_link))
-
-    if user is not None:
-        query = query.outerjoin(
-            UserFavorite,
-            and_(
-                UserFavorite.recipe_id == Recipe.recipe_id,
-                UserFavorite.user_id == user.user_id,
-            ),
+    if user is None:
+        key = await recipe_page_key(filters, cursor, limit, schema)
+        headers = recipe_page_cache_headers(make_etag(key), PUBLIC_CACHE_CONTROL)
+        if etag_matches(request, headers["ETag"]):
+            return not_modified_response(headers, response)
+        content = await get_recipes_page(
+            db_session, None, filters, cursor, limit, schema, key
         )
-        query = query.add_columns(UserFavorite.recipe_id)
-
-    if name:
-        query = query.where(Recipe.name.ilike(f"%{name}%"))
-    if tags:
-        query = query.where(Recipe.tags.contains(tags))
-    if ingredients:
-        query = query.where(func.jsonb_exists_all(Recipe.ingredients, ingredients))
-
-    recipes = await db_session.execute(query)
-    return [
-        recipe.Recipe.to_schema(
-            image_link=recipe.Recipe.image.image_link,
-            is_favorite=bool(recipe.recipe_id) if user else False,
+    else:
+        content = dumps(
+            await get_recipes_page(db_session, user, filters, cursor, limit, schema)
         )
-        for recipe in recipes
-    ]
+        headers = recipe_page_cache_headers(make_etag(content), PRIVATE_CACHE_CONTROL)
+    return cached_json_response(request, content, response, headers)
+
+
+@api_recipes_router.get("/stream")
+async def api_stream_recipes(
+    response: Response,
+    filters: RecipeFilters = Depends(),
+    format: StreamFormat = Query("json"),
+    user: User | None = Depends(current_user_or_none),
+):
+    async def content():
+        async with async_read_session_maker() as db_session:
+            async for chunk in stream_recipes(db_session, user, filters, format):
+                yield chunk
+
+    return with_cookies(
+        StreamingResponse(content(), media_type=STREAM_MEDIA_TYPES[format]), response
+    )
 
 
 @api_recipes_router.get("/favorites", response_model=list[RecipeSchema])
 async def api_get_favorites(
+    response: Response,
+    schema: type[BaseSchema] = Depends(recipe_fields),
+    user: User = Depends(current_user),
+    db_session: AsyncSession = Depends(async_db_read_session),
+):
+    return json_response(await get_favorites(db_session, user, schema), response)
+
+
+@api_recipes_router.post("/favorites/batch", response_model=FavoritesBatchResultSchema)
+async def api_update_favorites(
+    favorites_schema: FavoritesBatchSchema,
     user: User = Depends(current_user),
-    db_session: AsyncSession = Depends(async_db_session),
+    db_session: AsyncSession = Depends(async_db_write_session),
+):
+    if set(favorites_schema.add) & set(favorites_schema.remove):
+        raise HTTPException(400, "Recipe both added and removed")
+
+    added, removed = await update_favorites(
+        db_session, user, favorites_schema.add, favorites_schema.remove
+    )
+    await db_session.commit()
+    await invalidate_favorites(*added, *removed)
+    return FavoritesBatchResultSchema(added=added, removed=removed)
+
+
+@api_recipes_router.get("/facets", response_model=RecipeFacetsSchema)
+async def api_get_facets(
+    filters: RecipeFilters = Depends(),
+    limit: int = Query(RECIPES_PAGE_SIZE, ge=1, le=RECIPES_PAGE_SIZE_MAX),
+    db_session: AsyncSession = Depends(async_db_read_session),
 ):
-    recipes = await db_session.scalars(
-        select(Recipe)
-        .join(UserFavorite, UserFavorite.recipe_id == Recipe.recipe_id)
-        .where(UserFavorite.user_id == user.user_id)
-        .options(joinedload(Recipe.image).load_only(Image.image_link))
+    return RecipeFacetsSchema(
+        tags=await count_tag_facets(db_session, filters.where(), limit),
+        ingredients=await count_ingredient_facets(db_session, filters.where(), limit),
     )
-    return [
-        recipe.to_schema(image_link=recipe.image.image_link, is_favorite=True)
-        for recipe in recipes
-    ]
+
+
+@api_recipes_router.get("/pantry", response_model=list[PantryMatchSchema])
+async def api_match_pantry(
+    ingredients: list[str] = Query(...),
+    max_missing: int | None = Query(None, ge=0),
+    limit: int = Query(RECIPES_PAGE_SIZE, ge=1, le=RECIPES_PAGE_SIZE_MAX),
+    user: User | None = Depends(current_user_or_none),
+    db_session: AsyncSession = Depends(async_db_read_session),
+):
+    return await match_pantry(db_session, user, ingredients, limit, max_missing)
 
 
 @api_recipes_router.get("/{recipe_id}", response_model=RecipeSchema)
 async def api_get_recipe(
     recipe_id: UUID,
-    db_session: AsyncSession = Depends(async_db_session),
+    request: Request,
+    response: Response,
+    db_session: AsyncSession = Depends(async_db_read_session),
 ):
-    recipe = await db_session.get(
-        Recipe,
-        recipe_id,
-        options=[joinedload(Recipe.image).load_only(Image.image_link)],
-    )
-    if recipe is None:
-        raise HTTPException(404, "Recipe not found")
-
-    return recipe.to_schema(image_link=recipe.image.image_link)
+    recipe = await get_recipe(db_session, recipe_id)
+    record_views(recipe_id)
+    return cached_json_response(request, recipe, response, recipe_cache_headers(recipe))
 
 
 @api_recipes_router.delete("/{recipe_id}")
 async def api_delete_recipe(
     recipe_id: UUID,
     admin: User = Depends(current_admin),
-    db_session: AsyncSession = Depends(async_db_session),
+    db_session: AsyncSession = Depends(async_db_write_session),
 ):
     recipe = await db_session.get(Recipe, recipe_id)
     if recipe is None:
         raise HTTPException(404, "Recipe not found")
     await db_session.delete(recipe)
     await db_session.commit()
+    await invalidate_recipe(recipe_id)
 
 
 @api_recipes_router.post("/{recipe_id}/favorites")
 async def api_favorite_recipe(
     recipe_id: UUID,
     user: User = Depends(current_user),
-    db_session: AsyncSession = Depends(async_db_session),
+    db_session: AsyncSession = Depends(async_db_write_session),
 ):
-    user_favorite = await db_session.get(UserFavorite, (recipe_id, user.user_id))
-    if user_favorite is not None:
-        raise HTTPException(400, "Recipe already favorited")
-
-    user_favorite = UserFavorite(recipe_id=recipe_id, user_id=user.user_id)
-    db_session.add(user_favorite)
+    added, _ = await update_favorites(db_session, user, [recipe_id], [])
     await db_session.commit()
+    await invalidate_favorites(*added)
+    if not added:
+        if await db_session.get(Recipe, recipe_id) is None:
+            raise HTTPException(404, "Recipe not found")
+        raise HTTPException(400, "Recipe already favorited")
 
 
 @api_recipes_router.delete("/{recipe_id}/favorites")
 async def api_unfavorite_recipe(
     recipe_id: UUID,
     user: User = Depends(current_user),
-    db_session: AsyncSession = Depends(async_db_session),
+    db_session: AsyncSession = Depends(async_db_write_session),
 ):
-    user_favorite = await db_session.get(UserFavorite, (recipe_id, user.user_id))
-    if user_favorite is None:
-        raise HTTPException(400, "Recipe not favorited")
-
-    await db_session.delete(user_favorite)
+    _, removed = await update_favorites(db_session, user, [], [recipe_id])
     await db_session.commit()
+    await invalidate_favorites(*removed)
+    if not removed:
+        if await db_session.get(Recipe, recipe_id) is None:
+            raise HTTPException(404, "Recipe not found")
+        raise HTTPException(400, "Recipe not favorited")
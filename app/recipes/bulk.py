@@ -0,0 +1,258 @@
+import csv
+import io
+import json
+import time
+from datetime import datetime
+from typing import AsyncIterator, Literal
+from uuid import UUID, uuid4
+
+from pydantic import ValidationError
+from sqlalchemy import literal_column, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import RECIPES_IMPORT_BATCH_SIZE
+from app.core.models.recipe import (
+    CreateRecipeSchema,
+    Image,
+    ImportErrorSchema,
+    ImportResultSchema,
+    Recipe,
+)
+from app.recipes.cache import invalidate_recipe
+from app.recipes.facets import sync_terms
+from app.recipes.ranking import record_created
+
+BulkFormat = Literal["ndjson", "csv"]
+
+CSV_FIELDS = [
+    "name",
+    "description",
+    "action_to_cook",
+    "image_link",
+    "ingredients",
+    "tags",
+]
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+IMPORT_ERRORS_MAX = 100
+EXPORT_YIELD_PER = 1000
+
+
+async def iter_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    buffer = b""
+    async for chunk in stream:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+
+async def iter_ndjson(stream: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, bytes]]:
+    line_number = 0
+    async for line in iter_lines(stream):
+        line_number += 1
+        if line.strip():
+            yield line_number, line
+
+
+async def iter_csv(
+    stream: AsyncIterator[bytes],
+) -> AsyncIterator[tuple[int, tuple[list[str], bytes]]]:
+    header = None
+    record = b""
+    line_number = 0
+    async for line in iter_lines(stream):
+        line_number += 1
+        record += line + b"\n"
+        if record.count(b'"') % 2:
+            continue
+        value, record = record, b""
+        if not value.strip():
+            continue
+        if header is None:
+            header = next(csv.reader([value.decode(errors="replace")]))
+            continue
+        yield line_number, (header, value)
+
+
+def parse_ndjson(value: bytes) -> CreateRecipeSchema:
+    return CreateRecipeSchema.model_validate_json(value)
+
+
+def parse_csv(value: tuple[list[str], bytes]) -> CreateRecipeSchema:
+    header, record = value
+    row = dict(zip(header, next(csv.reader([record.decode()]))))
+    return CreateRecipeSchema.model_validate(
+        {
+            **row,
+            "ingredients": json.loads(row.get("ingredients") or "{}"),
+            "tags": json.loads(row.get("tags") or "[]"),
+        }
+    )
+
+
+async def upsert_recipes(
+    db_session: AsyncSession, recipe_schemas: list[CreateRecipeSchema]
+) -> list[UUID]:
+    recipe_schemas = list({schema.name: schema for schema in recipe_schemas}.values())
+    image_links = {schema.image_link for schema in recipe_schemas}
+
+    await db_session.execute(
+        insert(Image)
+        .values([{"image_id": uuid4(), "image_link": link} for link in image_links])
+        .on_conflict_do_nothing(index_elements=["image_link"])
+    )
+    image_ids = dict(
+        (
+            await db_session.execute(
+                select(Image.image_link, Image.image_id).where(
+                    Image.image_link.in_(image_links)
+                )
+            )
+        )
+        .tuples()
+        .all()
+    )
+
+    updated_at = datetime.utcnow()
+    stmt = insert(Recipe).values(
+        [
+            {
+                "recipe_id": uuid4(),
+                "image_id": image_ids[schema.image_link],
+                "name": schema.name,
+                "description": schema.description,
+                "action_to_cook": schema.action_to_cook,
+                "ingredients": schema.ingredients,
+                "tags": schema.tags,
+                "updated_at": updated_at,
+            }
+            for schema in recipe_schemas
+        ]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["name"],
+        set_={
+            "image_id": stmt.excluded.image_id,
+            "description": stmt.excluded.description,
+            "action_to_cook": stmt.excluded.action_to_cook,
+            "ingredients": stmt.excluded.ingredients,
+            "tags": stmt.excluded.tags,
+            "version": Recipe.version + 1,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    ).returning(Recipe.recipe_id, Recipe.name, literal_column("xmax = 0"))
+    rows = (await db_session.execute(stmt)).all()
+    recipe_ids = {name: recipe_id for recipe_id, name, _ in rows}
+    record_created(*(recipe_id for recipe_id, _, inserted in rows if inserted))
+
+    await sync_terms(
+        db_session,
+        {recipe_ids[schema.name]: schema.tags for schema in recipe_schemas},
+        {
+            recipe_ids[schema.name]: list(schema.ingredients)
+            for schema in recipe_schemas
+        },
+    )
+    return list(recipe_ids.values())
+
+
+async def import_recipes(
+    db_session: AsyncSession,
+    stream: AsyncIterator[bytes],
+    format: BulkFormat,
+    batch_size: int = RECIPES_IMPORT_BATCH_SIZE,
+) -> ImportResultSchema:
+    started_at = time.perf_counter()
+    rows, imported, invalid = 0, 0, 0
+    errors: list[ImportErrorSchema] = []
+    batch: list[CreateRecipeSchema] = []
+    batch_lines: list[int] = []
+
+    async def flush():
+        nonlocal imported, invalid
+        if not batch:
+            return
+        try:
+            recipe_ids = await upsert_recipes(db_session, batch)
+            await db_session.commit()
+        except DBAPIError as e:
+            await db_session.rollback()
+            invalid += len(batch)
+            if len(errors) < IMPORT_ERRORS_MAX:
+                errors.append(ImportErrorSchema(line=batch_lines[0], error=str(e.orig)))
+        else:
+            await invalidate_recipe(*recipe_ids)
+            imported += len(recipe_ids)
+        batch.clear()
+        batch_lines.clear()
+
+    records = iter_csv(stream) if format == "csv" else iter_ndjson(stream)
+    parse = parse_csv if format == "csv" else parse_ndjson
+    async for line_number, record in records:
+        rows += 1
+        try:
+            batch.append(parse(record))
+            batch_lines.append(line_number)
+        except (ValidationError, ValueError) as e:
+            invalid += 1
+            if len(errors) < IMPORT_ERRORS_MAX:
+                errors.append(ImportErrorSchema(line=line_number, error=str(e)))
+            continue
+        if len(batch) >= batch_size:
+            await flush()
+    await flush()
+
+    seconds = time.perf_counter() - started_at
+    return ImportResultSchema(
+        rows=rows,
+        imported=imported,
+        invalid=invalid,
+        errors=errors,
+        seconds=round(seconds, 3),
+        rows_per_second=round(rows / seconds, 1) if seconds else 0.0,
+    )
+
+
+def format_export_row(row: dict, format: BulkFormat) -> str:
+    if format == "ndjson":
+        return json.dumps(row, ensure_ascii=False) + "\n"
+
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(
+        [
+            json.dumps(value, ensure_ascii=False)
+            if isinstance(value, (dict, list))
+            else value
+            for value in row.values()
+        ]
+    )
+    return buffer.getvalue()
+
+
+async def export_recipes(
+    db_session: AsyncSession, format: BulkFormat
+) -> AsyncIterator[str]:
+    if format == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(CSV_FIELDS)
+        yield buffer.getvalue()
+
+    result = await db_session.stream(
+        select(
+            Recipe.name,
+            Recipe.description,
+            Recipe.action_to_cook,
+            Image.image_link,
+            Recipe.ingredients,
+            Recipe.tags,
+        )
+        .join(Image, Image.image_id == Recipe.image_id)
+        .order_by(Recipe.recipe_id)
+        .execution_options(yield_per=EXPORT_YIELD_PER)
+    )
+    async for partition in result.mappings().partitions():
+        yield "".join(format_export_row(dict(row), format) for row in partition)
@@ -0,0 +1,161 @@
+import hashlib
+import json
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import cache
+from app.core.config import (
+    DB_REPLICA_STICKY_SECONDS,
+    RECIPES_CACHE_TTL,
+    RECIPES_HTTP_MAX_AGE,
+    RECIPES_HTTP_STALE_WHILE_REVALIDATE,
+)
+from app.core.database import (
+    async_replica_engine,
+    is_replica_session,
+    is_sticky_primary_session,
+)
+from app.core.models.base import BaseSchema
+from app.core.models.recipe import RecipePageSchema, RecipeSchema
+from app.core.responses import cache_headers, make_etag
+from app.recipes.search import RecipeFilters
+
+RECIPE_KEY = "recipes:recipe:{}"
+RECIPE_PAGE_KEY = "recipes:page:{}:{}"
+RECIPE_PAGES_GENERATION_KEY = "recipes:pages:generation"
+RECIPE_SCORES_GENERATION_KEY = "recipes:scores:generation"
+RECIPE_FAVORITES_GENERATION_KEY = "recipes:favorites:generation"
+RECIPE_INGREDIENTS_GENERATION_KEY = "recipes:ingredients:generation"
+RECIPE_HTML_KEY = "recipes:html:{}:{}"
+RECIPES_WRITTEN_KEY = "recipes:written"
+
+PUBLIC_CACHE_CONTROL = (
+    f"public, max-age={RECIPES_HTTP_MAX_AGE}, "
+    f"stale-while-revalidate={RECIPES_HTTP_STALE_WHILE_REVALIDATE}"
+)
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+
+def reads_cache(db_session: AsyncSession) -> bool:
+    return not is_sticky_primary_session(db_session)
+
+
+async def fills_cache(db_session: AsyncSession) -> bool:
+    return (
+        not is_replica_session(db_session)
+        or await cache.get(RECIPES_WRITTEN_KEY) is None
+    )
+
+
+async def mark_recipes_written():
+    if async_replica_engine is not None:
+        await cache.set(RECIPES_WRITTEN_KEY, b"1", DB_REPLICA_STICKY_SECONDS)
+
+
+async def recipe_page_key(
+    filters: RecipeFilters, cursor: str | None, limit: int, schema: type[BaseSchema]
+) -> str:
+    params = json.dumps(
+        [
+            filters.name,
+            filters.q,
+            sorted(filters.tags) if filters.tags else None,
+            sorted(filters.ingredients) if filters.ingredients else None,
+            cursor,
+            limit,
+            list(schema.model_fields),
+            filters.sort,
+        ]
+    )
+    generation = str(await cache.get_counter(RECIPE_PAGES_GENERATION_KEY))
+    if filters.sort == "trending":
+        scores_generation = await cache.get_counter(RECIPE_SCORES_GENERATION_KEY)
+        generation = f"{generation}.s{scores_generation}"
+    if filters.sort == "popular" or "favorite_count" in schema.model_fields:
+        favorites_generation = await cache.get_counter(RECIPE_FAVORITES_GENERATION_KEY)
+        generation = f"{generation}.f{favorites_generation}"
+    return RECIPE_PAGE_KEY.format(generation, hashlib.sha1(params.encode()).hexdigest())
+
+
+def recipe_cache_headers(recipe: RecipeSchema) -> dict[str, str]:
+    return cache_headers(
+        make_etag(recipe.recipe_id, recipe.version, recipe.favorite_count),
+        PUBLIC_CACHE_CONTROL,
+        recipe.updated_at,
+    )
+
+
+def recipe_page_cache_headers(etag: str, cache_control: str) -> dict[str, str]:
+    return {**cache_headers(etag, cache_control), "Vary": "Cookie"}
+
+
+async def get_cached_recipe(recipe_id: UUID) -> RecipeSchema | None:
+    value = await cache.get(RECIPE_KEY.format(recipe_id))
+    return RecipeSchema.model_validate_json(value) if value else None
+
+
+async def set_cached_recipe(recipe: RecipeSchema):
+    await cache.set(
+        RECIPE_KEY.format(recipe.recipe_id),
+        recipe.model_dump_json().encode(),
+        RECIPES_CACHE_TTL,
+    )
+
+
+async def get_cached_recipe_page(
+    key: str, schema: type[BaseSchema]
+) -> RecipePageSchema | None:
+    value = await cache.get(key)
+    return RecipePageSchema[schema].model_validate_json(value) if value else None
+
+
+async def set_cached_recipe_page(key: str, page: RecipePageSchema):
+    await cache.set(key, page.model_dump_json().encode(), RECIPES_CACHE_TTL)
+
+
+html_cache_counters = {"hits": 0, "misses": 0}
+
+
+def html_cache_key(template: str, *parts) -> str:
+    params = json.dumps(parts, default=str)
+    return RECIPE_HTML_KEY.format(template, hashlib.sha1(params.encode()).hexdigest())
+
+
+async def get_cached_html(key: str) -> bytes | None:
+    value = await cache.get(key)
+    html_cache_counters["hits" if value is not None else "misses"] += 1
+    return value
+
+
+async def set_cached_html(key: str, content: bytes):
+    await cache.set(key, content, RECIPES_CACHE_TTL)
+
+
+def html_cache_stats() -> dict[str, float]:
+    hits, misses = html_cache_counters["hits"], html_cache_counters["misses"]
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+    }
+
+
+async def bump_recipe_scores_generation():
+    await cache.incr(RECIPE_SCORES_GENERATION_KEY)
+
+
+async def invalidate_recipe(*recipe_ids: UUID, ingredients: bool = True):
+    await mark_recipes_written()
+    await cache.delete(*(RECIPE_KEY.format(recipe_id) for recipe_id in recipe_ids))
+    await cache.incr(RECIPE_PAGES_GENERATION_KEY)
+    if ingredients:
+        await cache.incr(RECIPE_INGREDIENTS_GENERATION_KEY)
+
+
+async def invalidate_favorites(*recipe_ids: UUID):
+    if not recipe_ids:
+        return
+    await mark_recipes_written()
+    await cache.delete(*(RECIPE_KEY.format(recipe_id) for recipe_id in recipe_ids))
+    await cache.incr(RECIPE_FAVORITES_GENERATION_KEY)
@@ -0,0 +1,127 @@
+from uuid import UUID
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.models.recipe import (
+    FacetSchema,
+    Ingredient,
+    Recipe,
+    RecipeIngredient,
+    RecipeTag,
+    Tag,
+)
+
+INSERT_CHUNK_SIZE = 5000
+
+
+async def _sync_terms(
+    db_session: AsyncSession,
+    recipe_terms: dict[UUID, list[str]],
+    term,
+    term_id,
+    link,
+    link_term_id,
+):
+    names = {name for names in recipe_terms.values() for name in names}
+    term_ids = {}
+    if names:
+        await db_session.execute(
+            insert(term)
+            .values([{"name": name} for name in names])
+            .on_conflict_do_nothing(index_elements=["name"])
+        )
+        term_ids = dict(
+            (
+                await db_session.execute(
+                    select(term.name, term_id).where(term.name.in_(names))
+                )
+            )
+            .tuples()
+            .all()
+        )
+
+    await db_session.execute(delete(link).where(link.recipe_id.in_(list(recipe_terms))))
+
+    links = [
+        {"recipe_id": recipe_id, link_term_id.key: term_ids[name]}
+        for recipe_id, names in recipe_terms.items()
+        for name in set(names)
+    ]
+    for i in range(0, len(links), INSERT_CHUNK_SIZE):
+        await db_session.execute(
+            insert(link)
+            .values(links[i : i + INSERT_CHUNK_SIZE])
+            .on_conflict_do_nothing()
+        )
+
+
+async def sync_terms(
+    db_session: AsyncSession,
+    recipe_tags: dict[UUID, list[str]],
+    recipe_ingredients: dict[UUID, list[str]],
+):
+    await _sync_terms(
+        db_session, recipe_tags, Tag, Tag.tag_id, RecipeTag, RecipeTag.tag_id
+    )
+    await _sync_terms(
+        db_session,
+        recipe_ingredients,
+        Ingredient,
+        Ingredient.ingredient_id,
+        RecipeIngredient,
+        RecipeIngredient.ingredient_id,
+    )
+
+
+async def sync_recipe_terms(db_session: AsyncSession, recipe: Recipe):
+    await sync_terms(
+        db_session,
+        {recipe.recipe_id: recipe.tags},
+        {recipe.recipe_id: list(recipe.ingredients)},
+    )
+
+
+async def count_facets(
+    db_session: AsyncSession,
+    filters: list,
+    limit: int,
+    term,
+    term_id,
+    link,
+    link_term_id,
+) -> list[FacetSchema]:
+    count = func.count().label("count")
+    query = (
+        select(term.name, count)
+        .join(link, link_term_id == term_id)
+        .group_by(term.name)
+        .order_by(count.desc(), term.name)
+        .limit(limit)
+    )
+    if filters:
+        query = query.where(
+            link.recipe_id.in_(select(Recipe.recipe_id).where(*filters))
+        )
+
+    rows = await db_session.execute(query)
+    return [FacetSchema(name=row.name, count=row.count) for row in rows]
+
+
+async def count_tag_facets(db_session: AsyncSession, filters: list, limit: int):
+    return await count_facets(
+        db_session, filters, limit, Tag, Tag.tag_id, RecipeTag, RecipeTag.tag_id
+    )
+
+
+async def count_ingredient_facets(db_session: AsyncSession, filters: list, limit: int):
+    return await count_facets(
+        db_session,
+        filters,
+        limit,
+        Ingredient,
+        Ingredient.ingredient_id,
+        RecipeIngredient,
+        RecipeIngredient.ingredient_id,
+    )
@@ -0,0 +1,57 @@
+from functools import lru_cache
+
+from fastapi import HTTPException, Query
+from pydantic import create_model
+
+from app.core.models.base import BaseSchema
+from app.core.models.recipe import Image, Recipe, RecipeSchema
+
+RECIPE_COLUMNS = {
+    "recipe_id": Recipe.recipe_id,
+    "version": Recipe.version,
+    "updated_at": Recipe.updated_at,
+    "name": Recipe.name,
+    "description": Recipe.description,
+    "action_to_cook": Recipe.action_to_cook,
+    "image_link": Image.image_link,
+    "ingredients": Recipe.ingredients,
+    "tags": Recipe.tags,
+    "favorite_count": Recipe.favorite_count,
+}
+
+
+def schema_columns(schema: type[BaseSchema]) -> list:
+    return [
+        column for name, column in RECIPE_COLUMNS.items() if name in schema.model_fields
+    ]
+
+
+@lru_cache
+def fields_schema(fields: frozenset[str]) -> type[BaseSchema]:
+    names = [
+        name
+        for name in RecipeSchema.model_fields
+        if name in fields or name in ("recipe_id", "is_favorite")
+    ]
+    return create_model(
+        f"RecipeSchema[{','.join(names)}]",
+        __base__=BaseSchema,
+        **{
+            name: (
+                RecipeSchema.model_fields[name].annotation,
+                RecipeSchema.model_fields[name],
+            )
+            for name in names
+        },
+    )
+
+
+def recipe_fields(fields: str | None = Query(None)) -> type[BaseSchema]:
+    if not fields:
+        return RecipeSchema
+
+    names = frozenset(name.strip() for name in fields.split(",") if name.strip())
+    unknown = names - RECIPE_COLUMNS.keys() - {"is_favorite"}
+    if unknown:
+        raise HTTPException(400, f"Unknown fields: {', '.join(sorted(unknown))}")
+    return fields_schema(names)
@@ -0,0 +1,292 @@
+import asyncio
+import logging
+import time
+from array import array
+from collections import Counter
+from typing import Iterable, Iterator
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import cache
+from app.core.config import RECIPES_PANTRY_REBUILD_INTERVAL
+from app.core.models.recipe import (
+    Ingredient,
+    PantryMatchSchema,
+    Recipe,
+    RecipeIngredient,
+)
+from app.core.models.user import User
+from app.recipes.cache import RECIPE_INGREDIENTS_GENERATION_KEY
+from app.recipes.services import mark_favorites, select_recipes
+
+logger = logging.getLogger(__name__)
+
+PANTRY_INDEX_YIELD_PER = 10000
+PANTRY_DENSE_RATIO = 256
+
+
+def normalize_ingredient(name: str) -> str:
+    return " ".join(name.casefold().split())
+
+
+def positions_mask(positions: Iterable[int], size: int) -> int:
+    bits = bytearray((size + 7) // 8)
+    for position in positions:
+        bits[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(bits, "little")
+
+
+def iter_positions(mask: int) -> Iterator[int]:
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def add_mask(planes: list[int], mask: int, bit: int = 0):
+    planes.extend([0] * (bit - len(planes)))
+    while mask:
+        if bit == len(planes):
+            planes.append(mask)
+            return
+        planes[bit], mask = planes[bit] ^ mask, planes[bit] & mask
+        bit += 1
+
+
+def equals_mask(planes: list[int], value: int, universe: int) -> int:
+    if value >> len(planes):
+        return 0
+    mask = universe
+    for i, plane in enumerate(planes):
+        mask &= plane if value >> i & 1 else ~plane
+    return mask
+
+
+def posting_size(posting: int | array) -> int:
+    if isinstance(posting, int):
+        return (posting.bit_length() + 7) // 8
+    return len(posting) * posting.itemsize
+
+
+class PantryIndex:
+    def __init__(self, generation: int = 0):
+        self.generation = generation
+        self.built_at = 0.0
+        self.recipe_ids = bytearray()
+        self.names: list[str] = []
+        self.name_terms: list[str] = []
+        self.offsets = array("I", [0])
+        self.recipe_names = array("I")
+        self.postings: dict[str, int | array] = {}
+        self.sizes: dict[int, int] = {}
+        self.universe = 0
+
+        self._name_ids: dict[str, int] = {}
+        self._last_recipe_id: UUID | None = None
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def add(self, rows: Iterable[tuple[UUID, str]]):
+        offsets, recipe_names = self.offsets, self.recipe_names
+        postings, name_ids, name_terms = self.postings, self._name_ids, self.name_terms
+        position = len(self) - 1
+        for recipe_id, name in rows:
+            if recipe_id != self._last_recipe_id:
+                self._last_recipe_id = recipe_id
+                self.recipe_ids += recipe_id.bytes
+                offsets.append(offsets[-1])
+                position += 1
+
+            name_id = name_ids.get(name)
+            if name_id is None:
+                name_id = name_ids[name] = len(self.names)
+                self.names.append(name)
+                name_terms.append(normalize_ingredient(name))
+
+            positions = postings.get(name_terms[name_id])
+            if positions is None:
+                positions = postings[name_terms[name_id]] = array("I")
+            if not positions or positions[-1] != position:
+                positions.append(position)
+                recipe_names.append(name_id)
+                offsets[-1] += 1
+
+    def build(self) -> "PantryIndex":
+        size = len(self)
+        self.universe = (1 << size) - 1
+        for term, positions in self.postings.items():
+            if len(positions) * PANTRY_DENSE_RATIO >= size:
+                self.postings[term] = positions_mask(positions, size)
+
+        sizes: dict[int, list[int]] = {}
+        for position in range(size):
+            count = self.offsets[position + 1] - self.offsets[position]
+            sizes.setdefault(count, []).append(position)
+        self.sizes = {
+            count: positions_mask(count_positions, size)
+            for count, count_positions in sorted(sizes.items(), reverse=True)
+        }
+
+        self._name_ids.clear()
+        self._last_recipe_id = None
+        self.built_at = time.monotonic()
+        return self
+
+    def recipe_id(self, position: int) -> UUID:
+        return UUID(bytes=bytes(self.recipe_ids[position * 16 : position * 16 + 16]))
+
+    def missing_masks(self, terms: set[str], max_missing: int | None) -> Iterator[int]:
+        planes: list[int] = []
+        counts: Counter[int] = Counter()
+        for term in terms & self.postings.keys():
+            posting = self.postings[term]
+            if isinstance(posting, int):
+                add_mask(planes, posting)
+            else:
+                counts.update(posting)
+
+        for count in set(counts.values()):
+            mask = positions_mask(
+                (position for position, n in counts.items() if n == count), len(self)
+            )
+            for bit in range(count.bit_length()):
+                if count >> bit & 1:
+                    add_mask(planes, mask, bit)
+        if not planes:
+            return
+
+        matched = {}
+        for missing in range(max(self.sizes, default=0) + 1):
+            if max_missing is not None and missing > max_missing:
+                return
+            for count, size_mask in self.sizes.items():
+                if count - missing < 1:
+                    continue
+                if count - missing not in matched:
+                    matched[count - missing] = equals_mask(
+                        planes, count - missing, self.universe
+                    )
+                yield size_mask & matched[count - missing]
+
+    def match(
+        self, pantry: Iterable[str], limit: int, max_missing: int | None = None
+    ) -> list[tuple[UUID, int, list[str]]]:
+        terms = {normalize_ingredient(name) for name in pantry}
+        matches = []
+        for mask in self.missing_masks(terms, max_missing):
+            for position in iter_positions(mask):
+                name_ids = self.recipe_names[
+                    self.offsets[position] : self.offsets[position + 1]
+                ]
+                missing = [
+                    self.names[name_id]
+                    for name_id in name_ids
+                    if self.name_terms[name_id] not in terms
+                ]
+                matches.append(
+                    (self.recipe_id(position), len(name_ids) - len(missing), missing)
+                )
+                if len(matches) >= limit:
+                    return matches
+        return matches
+
+    def stats(self) -> dict[str, float]:
+        dense = sum(isinstance(posting, int) for posting in self.postings.values())
+        return {
+            "recipes": len(self),
+            "terms": len(self.postings),
+            "dense_terms": dense,
+            "sparse_terms": len(self.postings) - dense,
+            "postings_bytes": sum(map(posting_size, self.postings.values())),
+            "sizes_bytes": sum(map(posting_size, self.sizes.values())),
+            "recipes_bytes": len(self.recipe_ids)
+            + posting_size(self.offsets)
+            + posting_size(self.recipe_names),
+            "generation": self.generation,
+            "age": time.monotonic() - self.built_at,
+        }
+
+
+pantry_index: PantryIndex | None = None
+pantry_index_lock = asyncio.Lock()
+
+
+async def load_pantry_index(db_session: AsyncSession, generation: int) -> PantryIndex:
+    started_at = time.perf_counter()
+    result = await db_session.stream(
+        select(RecipeIngredient.recipe_id, Ingredient.name)
+        .join(Ingredient, Ingredient.ingredient_id == RecipeIngredient.ingredient_id)
+        .order_by(RecipeIngredient.recipe_id)
+        .execution_options(yield_per=PANTRY_INDEX_YIELD_PER)
+    )
+    index = PantryIndex(generation)
+    async for partition in result.partitions():
+        await asyncio.to_thread(index.add, partition)
+    await asyncio.to_thread(index.build)
+
+    stats = index.stats()
+    logger.info(
+        "Built pantry index for %d recipes (%d dense, %d sparse terms, %d bytes) "
+        "in %.3fs",
+        stats["recipes"],
+        stats["dense_terms"],
+        stats["sparse_terms"],
+        stats["postings_bytes"] + stats["sizes_bytes"] + stats["recipes_bytes"],
+        time.perf_counter() - started_at,
+    )
+    return index
+
+
+async def get_pantry_index(db_session: AsyncSession) -> PantryIndex:
+    global pantry_index
+    generation = await cache.get_counter(RECIPE_INGREDIENTS_GENERATION_KEY)
+    if pantry_index is not None and (
+        pantry_index.generation == generation
+        or pantry_index_lock.locked()
+        or time.monotonic() - pantry_index.built_at < RECIPES_PANTRY_REBUILD_INTERVAL
+    ):
+        return pantry_index
+
+    async with pantry_index_lock:
+        if pantry_index is None or pantry_index.generation != generation:
+            pantry_index = await load_pantry_index(db_session, generation)
+    return pantry_index
+
+
+def pantry_index_stats() -> dict[str, float]:
+    return pantry_index.stats() if pantry_index is not None else {}
+
+
+async def match_pantry(
+    db_session: AsyncSession,
+    user: User | None,
+    ingredients: list[str],
+    limit: int,
+    max_missing: int | None = None,
+) -> list[PantryMatchSchema]:
+    index = await get_pantry_index(db_session)
+    matches = index.match(ingredients, limit, max_missing)
+    if not matches:
+        return []
+
+    recipes = {
+        recipe["recipe_id"]: recipe
+        for recipe in (
+            await db_session.execute(
+                select_recipes(PantryMatchSchema).where(
+                    Recipe.recipe_id.in_([recipe_id for recipe_id, _, _ in matches])
+                )
+            )
+        ).mappings()
+    }
+    results = [
+        PantryMatchSchema.from_row(recipes[recipe_id], matched=matched, missing=missing)
+        for recipe_id, matched, missing in matches
+        if recipe_id in recipes
+    ]
+    if user is None:
+        return results
+    return await mark_favorites(db_session, user, results)
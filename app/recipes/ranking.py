@@ -0,0 +1,117 @@
+import asyncio
+import logging
+import math
+from collections import Counter
+from datetime import datetime
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import Float, Uuid, column, func, literal, select, values
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import (
+    RECIPES_SCORES_FLUSH_INTERVAL,
+    RECIPES_TRENDING_CREATED_WEIGHT,
+    RECIPES_TRENDING_FAVORITE_WEIGHT,
+    RECIPES_TRENDING_HALF_LIFE_HOURS,
+    RECIPES_TRENDING_VIEW_WEIGHT,
+)
+from app.core.database import async_session_maker
+from app.core.models.recipe import Recipe, RecipeScore
+from app.recipes.cache import bump_recipe_scores_generation
+from app.recipes.search import RecipeSort
+
+logger = logging.getLogger(__name__)
+
+TRENDING_EPOCH = datetime(2024, 1, 1)
+TRENDING_TAU = RECIPES_TRENDING_HALF_LIFE_HOURS * 3600 / math.log(2)
+
+pending_scores: Counter[UUID] = Counter()
+
+
+def record_views(*recipe_ids: UUID):
+    for recipe_id in recipe_ids:
+        pending_scores[recipe_id] += RECIPES_TRENDING_VIEW_WEIGHT
+
+
+def record_favorites(*recipe_ids: UUID):
+    for recipe_id in recipe_ids:
+        pending_scores[recipe_id] += RECIPES_TRENDING_FAVORITE_WEIGHT
+
+
+def record_created(*recipe_ids: UUID):
+    for recipe_id in recipe_ids:
+        pending_scores[recipe_id] += RECIPES_TRENDING_CREATED_WEIGHT
+
+
+def trending_increment(weight: float, at: datetime) -> float:
+    return math.log(weight) + (at - TRENDING_EPOCH).total_seconds() / TRENDING_TAU
+
+
+def log_add(a, b):
+    return func.greatest(a, b) + func.ln(1 + func.exp(-func.abs(a - b)))
+
+
+async def flush_scores(db_session: AsyncSession, scores: Iterable[tuple[UUID, float]]):
+    now = datetime.utcnow()
+    rows = [
+        (recipe_id, trending_increment(weight, now))
+        for recipe_id, weight in sorted(scores)
+        if weight > 0
+    ]
+    if not rows:
+        return
+
+    events = values(
+        column("recipe_id", Uuid), column("trending", Float), name="events"
+    ).data(rows)
+    stmt = insert(RecipeScore).from_select(
+        ["recipe_id", "trending", "updated_at"],
+        select(events.c.recipe_id, events.c.trending, literal(now)).join(
+            Recipe, Recipe.recipe_id == events.c.recipe_id
+        ),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["recipe_id"],
+        set_={
+            "trending": log_add(RecipeScore.trending, stmt.excluded.trending),
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    await db_session.execute(stmt)
+    await db_session.commit()
+
+
+async def flush_pending_scores():
+    global pending_scores
+    if not pending_scores:
+        return
+    scores, pending_scores = pending_scores, Counter()
+    try:
+        async with async_session_maker() as db_session:
+            await flush_scores(db_session, scores.items())
+    except BaseException:
+        pending_scores.update(scores)
+        raise
+    await bump_recipe_scores_generation()
+
+
+async def run_scores_job(interval: float = RECIPES_SCORES_FLUSH_INTERVAL):
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await flush_pending_scores()
+            except Exception:
+                logger.exception("Failed to flush recipe scores")
+    finally:
+        await flush_pending_scores()
+
+
+def sort_key(sort: RecipeSort):
+    if sort == "trending":
+        return RecipeScore.trending, RecipeScore.recipe_id, float
+    if sort == "popular":
+        return Recipe.favorite_count, Recipe.recipe_id, int
+    return Recipe.created_at, Recipe.recipe_id, datetime.fromisoformat
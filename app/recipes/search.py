@@ -0,0 +1,65 @@
+from typing import Literal
+
+from fastapi import Query
+from sqlalchemy import Text, func, literal, literal_column, or_
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.core.models.recipe import Recipe
+
+RecipeSort = Literal["trending", "popular", "new"]
+
+SEARCH_CONFIG = literal_column("'russian'::regconfig")
+
+
+def search_query(q: str):
+    return func.websearch_to_tsquery(SEARCH_CONFIG, q)
+
+
+def search_filter(q: str):
+    return or_(
+        Recipe.search_vector.bool_op("@@")(search_query(q)),
+        Recipe.name.bool_op("%")(q),
+    )
+
+
+def search_rank(q: str):
+    return func.ts_rank_cd(Recipe.search_vector, search_query(q)) + func.similarity(
+        Recipe.name, q
+    )
+
+
+def recipe_filters(
+    name: str | None = None,
+    q: str | None = None,
+    tags: list[str] | None = None,
+    ingredients: list[str] | None = None,
+):
+    filters = []
+    if name:
+        filters.append(Recipe.name.ilike(f"%{name}%"))
+    if q:
+        filters.append(search_filter(q))
+    if tags:
+        filters.append(Recipe.tags.contains(tags))
+    if ingredients:
+        filters.append(Recipe.ingredients.has_all(literal(ingredients, ARRAY(Text))))
+    return filters
+
+
+class RecipeFilters:
+    def __init__(
+        self,
+        name: str | None = Query(None),
+        q: str | None = Query(None),
+        tags: list[str] | None = Query(None),
+        ingredients: list[str] | None = Query(None),
+        sort: RecipeSort | None = Query(None),
+    ):
+        self.name = name
+        self.q = q
+        self.tags = tags
+        self.ingredients = ingredients
+        self.sort = sort
+
+    def where(self):
+        return recipe_filters(self.name, self.q, self.tags, self.ingredients)
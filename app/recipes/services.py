@@ -0,0 +1,277 @@
+from typing import AsyncIterator, Literal
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import delete, literal, select, tuple_, union_all, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.models.base import BaseSchema
+from app.core.models.recipe import (
+    Image,
+    Recipe,
+    RecipePageSchema,
+    RecipeSchema,
+    RecipeScore,
+    UserFavorite,
+)
+from app.core.models.user import User
+from app.core.responses import dumps
+from app.recipes.cache import (
+    fills_cache,
+    get_cached_recipe,
+    get_cached_recipe_page,
+    reads_cache,
+    recipe_page_key,
+    set_cached_recipe,
+    set_cached_recipe_page,
+)
+from app.recipes.fields import schema_columns
+from app.recipes.pagination import decode_cursor, encode_cursor
+from app.recipes.ranking import record_favorites, sort_key
+from app.recipes.search import RecipeFilters, search_rank
+
+StreamFormat = Literal["json", "ndjson"]
+
+STREAM_MEDIA_TYPES = {"json": "application/json", "ndjson": "application/x-ndjson"}
+STREAM_YIELD_PER = 500
+
+
+def select_recipes(schema: type[BaseSchema] = RecipeSchema, *columns):
+    query = select(*schema_columns(schema), *columns)
+    if "image_link" in schema.model_fields:
+        query = query.join(Image, Image.image_id == Recipe.image_id)
+    return query
+
+
+def sort_recipes(query, filters: RecipeFilters):
+    if filters.sort == "trending":
+        query = query.join(RecipeScore, RecipeScore.recipe_id == Recipe.recipe_id)
+    if filters.sort is not None:
+        return query, *sort_key(filters.sort)
+    if filters.q:
+        return query, search_rank(filters.q), Recipe.recipe_id, float
+    return query, None, None, None
+
+
+async def load_recipes_page(
+    db_session: AsyncSession,
+    filters: RecipeFilters,
+    cursor: str | None,
+    limit: int,
+    schema: type[BaseSchema] = RecipeSchema,
+) -> RecipePageSchema:
+    query = (
+        select_recipes(schema, Recipe.name.label("cursor_name"))
+        .where(*filters.where())
+        .limit(limit + 1)
+    )
+
+    query, key, key_id, key_type = sort_recipes(query, filters)
+    if key is not None:
+        query = query.add_columns(key.label("cursor_key"))
+        query = query.order_by(key.desc(), key_id.desc())
+        if cursor is not None:
+            cursor_key, cursor_id = decode_cursor(cursor, key_type, UUID)
+            query = query.where(tuple_(key, key_id) < tuple_(cursor_key, cursor_id))
+    else:
+        query = query.order_by(Recipe.name, Recipe.recipe_id)
+        if cursor is not None:
+            cursor_name, cursor_id = decode_cursor(cursor, str, UUID)
+            query = query.where(
+                tuple_(Recipe.name, Recipe.recipe_id) > tuple_(cursor_name, cursor_id)
+            )
+
+    recipes = (await db_session.execute(query)).all()
+
+    next_cursor = None
+    if len(recipes) > limit:
+        recipes = recipes[:limit]
+        last = recipes[-1]
+        if key is not None:
+            next_cursor = encode_cursor(last.cursor_key, last.recipe_id)
+        else:
+            next_cursor = encode_cursor(last.cursor_name, last.recipe_id)
+
+    return RecipePageSchema[schema](
+        items=[schema.from_row(recipe._mapping) for recipe in recipes],
+        next_cursor=next_cursor,
+    )
+
+
+async def mark_favorites(
+    db_session: AsyncSession, user: User, recipes: list[BaseSchema]
+) -> list[BaseSchema]:
+    if not recipes:
+        return recipes
+
+    favorite_ids = set(
+        await db_session.scalars(
+            select(UserFavorite.recipe_id)
+            .where(UserFavorite.user_id == user.user_id)
+            .where(UserFavorite.recipe_id.in_([r.recipe_id for r in recipes]))
+        )
+    )
+    return [
+        recipe.model_copy(update={"is_favorite": recipe.recipe_id in favorite_ids})
+        for recipe in recipes
+    ]
+
+
+async def get_recipes_page(
+    db_session: AsyncSession,
+    user: User | None,
+    filters: RecipeFilters,
+    cursor: str | None,
+    limit: int,
+    schema: type[BaseSchema] = RecipeSchema,
+    key: str | None = None,
+) -> RecipePageSchema:
+    if key is None:
+        key = await recipe_page_key(filters, cursor, limit, schema)
+    page = None
+    if reads_cache(db_session):
+        page = await get_cached_recipe_page(key, schema)
+    if page is None:
+        page = await load_recipes_page(db_session, filters, cursor, limit, schema)
+        if await fills_cache(db_session):
+            await set_cached_recipe_page(key, page)
+
+    if user is None:
+        return page
+
+    return page.model_copy(
+        update={"items": await mark_favorites(db_session, user, page.items)}
+    )
+
+
+async def stream_recipes(
+    db_session: AsyncSession,
+    user: User | None,
+    filters: RecipeFilters,
+    format: StreamFormat,
+) -> AsyncIterator[bytes]:
+    favorite_ids = set()
+    if user is not None:
+        favorite_ids = set(
+            await db_session.scalars(
+                select(UserFavorite.recipe_id).where(
+                    UserFavorite.user_id == user.user_id
+                )
+            )
+        )
+
+    query = (
+        select_recipes()
+        .where(*filters.where())
+        .execution_options(yield_per=STREAM_YIELD_PER)
+    )
+    query, key, key_id, _ = sort_recipes(query, filters)
+    if key is not None:
+        query = query.order_by(key.desc(), key_id.desc())
+    else:
+        query = query.order_by(Recipe.name, Recipe.recipe_id)
+
+    separator = b"," if format == "json" else b"\n"
+    if format == "json":
+        yield b"["
+
+    first = True
+    recipes = await db_session.stream(query)
+    async for partition in recipes.mappings().partitions():
+        chunk = separator.join(
+            dumps({**recipe, "is_favorite": recipe["recipe_id"] in favorite_ids})
+            for recipe in partition
+        )
+        if format == "ndjson":
+            chunk += separator
+        elif not first:
+            chunk = separator + chunk
+        first = False
+        yield chunk
+
+    if format == "json":
+        yield b"]"
+
+
+async def get_favorites(
+    db_session: AsyncSession, user: User, schema: type[BaseSchema] = RecipeSchema
+) -> list[BaseSchema]:
+    recipes = await db_session.execute(
+        select_recipes(schema)
+        .join(UserFavorite, UserFavorite.recipe_id == Recipe.recipe_id)
+        .where(UserFavorite.user_id == user.user_id)
+    )
+    return [schema.from_row(recipe, is_favorite=True) for recipe in recipes.mappings()]
+
+
+async def update_favorites(
+    db_session: AsyncSession,
+    user: User,
+    add: list[UUID],
+    remove: list[UUID],
+) -> tuple[list[UUID], list[UUID]]:
+    inserted = (
+        insert(UserFavorite)
+        .from_select(
+            ["recipe_id", "user_id"],
+            select(Recipe.recipe_id, literal(user.user_id)).where(
+                Recipe.recipe_id.in_(add)
+            ),
+        )
+        .on_conflict_do_nothing()
+        .returning(UserFavorite.recipe_id)
+        .cte("inserted")
+    )
+    deleted = (
+        delete(UserFavorite)
+        .where(UserFavorite.user_id == user.user_id)
+        .where(UserFavorite.recipe_id.in_(remove))
+        .returning(UserFavorite.recipe_id)
+        .cte("deleted")
+    )
+    deltas = union_all(
+        select(inserted.c.recipe_id, literal(1).label("delta")),
+        select(deleted.c.recipe_id, literal(-1).label("delta")),
+    ).subquery("deltas")
+
+    rows = await db_session.execute(
+        update(Recipe)
+        .where(Recipe.recipe_id == deltas.c.recipe_id)
+        .values(
+            favorite_count=Recipe.favorite_count + deltas.c.delta,
+            updated_at=Recipe.updated_at,
+        )
+        .returning(Recipe.recipe_id, deltas.c.delta)
+        .execution_options(synchronize_session=False)
+    )
+    changes = rows.all()
+
+    added = [recipe_id for recipe_id, delta in changes if delta > 0]
+    removed = [recipe_id for recipe_id, delta in changes if delta < 0]
+    record_favorites(*added)
+    return added, removed
+
+
+async def get_recipe(db_session: AsyncSession, recipe_id: UUID) -> RecipeSchema:
+    if reads_cache(db_session):
+        cached = await get_cached_recipe(recipe_id)
+        if cached is not None:
+            return cached
+
+    recipe = (
+        (
+            await db_session.execute(
+                select_recipes().where(Recipe.recipe_id == recipe_id)
+            )
+        )
+        .mappings()
+        .one_or_none()
+    )
+    if recipe is None:
+        raise HTTPException(404, "Recipe not found")
+
+    schema = RecipeSchema.from_row(recipe)
+    if await fills_cache(db_session):
+        await set_cached_recipe(schema)
+    return schema
@@ -1,50 +1,116 @@
-from fastapi import APIRouter, Depends, Request
-from fastapi.responses import RedirectResponse
-from fastapi.templating import Jinja2Templates
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.api_routers import api_logout
 from app.auth.helpers import current_user_or_none
-from app.core.database import async_db_session
-from app.core.models.recipe import RecipeSchema
+from app.core.assets import manifest_version
+from app.core.config import RECIPES_PAGE_SIZE, RECIPES_PAGE_SIZE_MAX
+from app.core.database import async_db_read_session
+from app.core.models.recipe import RecipeSummarySchema
 from app.core.models.user import Role, User
-from app.recipes.api_routers import api_get_favorites, api_get_recipe, api_get_recipes
+from app.core.responses import with_cookies
+from app.core.templates import templates
+from app.recipes.cache import (
+    fills_cache,
+    get_cached_html,
+    html_cache_key,
+    reads_cache,
+    recipe_page_key,
+    set_cached_html,
+)
+from app.recipes.ranking import record_views
+from app.recipes.search import RecipeFilters
+from app.recipes.services import get_favorites, get_recipe, get_recipes_page
 
 view_recipes_router = APIRouter(tags=["views"])
 
-templates = Jinja2Templates(directory="app/templates")
+
+def render(request: Request, sub_response: Response, name: str, context: dict):
+    return with_cookies(
+        templates.TemplateResponse(request=request, name=name, context=context),
+        sub_response,
+    )
+
+
+async def render_cached(
+    request: Request,
+    sub_response: Response,
+    db_session: AsyncSession,
+    name: str,
+    context: dict,
+    *key_parts,
+):
+    key = html_cache_key(name, str(request.base_url), manifest_version, *key_parts)
+    content = None
+    if reads_cache(db_session):
+        content = await get_cached_html(key)
+    if content is None:
+        template = templates.get_template(name)
+        content = template.render(request=request, **context).encode()
+        if await fills_cache(db_session):
+            await set_cached_html(key, content)
+    return with_cookies(HTMLResponse(content), sub_response)
+
+
+def redirect(url: str, sub_response: Response):
+    return with_cookies(RedirectResponse(url), sub_response)
 
 
 @view_recipes_router.get("/")
 async def view_index(
     request: Request,
+    response: Response,
+    filters: RecipeFilters = Depends(),
+    cursor: str | None = Query(None),
+    limit: int = Query(RECIPES_PAGE_SIZE, ge=1, le=RECIPES_PAGE_SIZE_MAX),
     user: User | None = Depends(current_user_or_none),
-    recipes: list[RecipeSchema] = Depends(api_get_recipes),
+    db_session: AsyncSession = Depends(async_db_read_session),
 ):
-    return templates.TemplateResponse(
-        request=request,
-        name="index.html",
-        context={
-            "recipes": recipes,
+    key = await recipe_page_key(filters, cursor, limit, RecipeSummarySchema)
+    page = await get_recipes_page(
+        db_session, user, filters, cursor, limit, RecipeSummarySchema, key
+    )
+
+    next_url = None
+    if page.next_cursor is not None:
+        next_url = request.url.include_query_params(cursor=page.next_cursor)
+
+    return await render_cached(
+        request,
+        response,
+        db_session,
+        "index.html",
+        {
+            "recipes": page.items,
+            "next_url": next_url,
             "user": user.to_schema() if user else None,
         },
+        key,
+        request.url.query,
+        user is not None,
+        [recipe.is_favorite for recipe in page.items] if user else None,
     )
 
 
 @view_recipes_router.get("/recipes/favorites")
 async def view_favorites(
     request: Request,
+    response: Response,
     user: User | None = Depends(current_user_or_none),
-    db_session: AsyncSession = Depends(async_db_session),
+    db_session: AsyncSession = Depends(async_db_read_session),
 ):
     if user is None:
-        return RedirectResponse("/auth/login")
-
-    recipes = await api_get_favorites(user, db_session)
-    return templates.TemplateResponse(
-        request=request,
-        name="favorites.html",
-        context={
+        return redirect("/auth/login", response)
+
+    recipes = await get_favorites(db_session, user, RecipeSummarySchema)
+    return render(
+        request,
+        response,
+        "favorites.html",
+        {
             "recipes": recipes,
             "user": user.to_schema() if user else None,
         },
@@ -54,83 +120,93 @@ async def view_favorites(
 @view_recipes_router.get("/recipes/{recipe_id}")
 async def view_recipe(
     request: Request,
+    response: Response,
+    recipe_id: UUID,
     user: User | None = Depends(current_user_or_none),
-    recipe: RecipeSchema = Depends(api_get_recipe),
+    db_session: AsyncSession = Depends(async_db_read_session),
 ):
-    return templates.TemplateResponse(
-        request=request,
-        name="recipe.html",
-        context={"recipe": recipe, "user": user.to_schema() if user else None},
+    recipe = await get_recipe(db_session, recipe_id)
+    record_views(recipe_id)
+    return await render_cached(
+        request,
+        response,
+        db_session,
+        "recipe.html",
+        {"recipe": recipe, "user": user.to_schema() if user else None},
+        recipe.recipe_id,
+        recipe.version,
+        user is not None,
     )
 
 
 @view_recipes_router.get("/admin/recipes")
 async def view_create_recipe(
     request: Request,
+    response: Response,
     user: User | None = Depends(current_user_or_none),
 ):
     if user is None:
-        return RedirectResponse("/auth/login")
+        return redirect("/auth/login", response)
     if user.role != Role.ADMIN:
-        return RedirectResponse("/auth/login")
+        return redirect("/auth/login", response)
 
-    return templates.TemplateResponse(
-        request=request,
-        name="admin/recipe.html",
-        context={"user": user.to_schema()},
+    return render(
+        request,
+        response,
+        "admin/recipe.html",
+        {"user": user.to_schema()},
     )
 
 
 @view_recipes_router.get("/admin/recipes/{recipe_id}")
 async def view_edit_recipe(
     request: Request,
+    response: Response,
+    recipe_id: UUID,
     user: User | None = Depends(current_user_or_none),
-    recipe: RecipeSchema = Depends(api_get_recipe),
+    db_session: AsyncSession = Depends(async_db_read_session),
 ):
     if user is None:
-        return RedirectResponse("/auth/login")
+        return redirect("/auth/login", response)
     if user.role != Role.ADMIN:
-        return RedirectResponse("/auth/login")
-
-    return templates.TemplateResponse(
-        request=request,
-        name="admin/recipe.html",
-        context={"recipe": recipe, "user": user.to_schema()},
+        return redirect("/auth/login", response)
+
+    recipe = await get_recipe(db_session, recipe_id)
+    return render(
+        request,
+        response,
+        "admin/recipe.html",
+        {"recipe": recipe, "user": user.to_schema()},
     )
 
 
 @view_recipes_router.get("/auth/register")
 async def view_register(
     request: Request,
+    response: Response,
     user: User | None = Depends(current_user_or_none),
 ):
     if user is not None:
-        return RedirectResponse("/")
+        return redirect("/", response)
 
-    return templates.TemplateResponse(
-        request=request,
-        name="auth/register.html",
-        context={},
-    )
+    return render(request, response, "auth/register.html", {})
 
 
 @view_recipes_router.get("/auth/login")
 async def view_login(
     request: Request,
+    response: Response,
     user: User | None = Depends(current_user_or_none),
 ):
     if user is not None:
-        return RedirectResponse("/")
+        return redirect("/", response)
 
-    return templates.TemplateResponse(
-        request=request,
-        name="auth/login.html",
-        context={},
-    )
+    return render(request, response, "auth/login.html", {})
 
 
 @view_recipes_router.get("/auth/logout")
 async def view_logout(
+    response: Response,
     logout=Depends(api_logout),
 ):
-    return RedirectResponse("/")
+    return redirect("/", response)
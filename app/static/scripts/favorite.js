@@ -1,4 +1,8 @@
 
+var pendingFavorites = new Map();
+var favoritesTimer = null;
+var FAVORITES_FLUSH_DELAY = 500;
+
 document.querySelectorAll('.favorite-button').forEach(function (button) {
     button.addEventListener('click', function () {
         var recipeCard = this.parentElement;
@@ -20,27 +24,62 @@ document.querySelectorAll('.favorite-button').forEach(function (button) {
     });
 });
 
-function addToFavorites(recipeId, callback) {
+window.addEventListener('pagehide', function () {
+    flushFavorites(true);
+});
+
+function queueFavorite(recipeId, action) {
+    var pending = pendingFavorites.get(recipeId);
+    if (pending !== undefined && pending !== action) {
+        pendingFavorites.delete(recipeId);
+    } else {
+        pendingFavorites.set(recipeId, action);
+    }
+
+    clearTimeout(favoritesTimer);
+    favoritesTimer = setTimeout(flushFavorites, FAVORITES_FLUSH_DELAY);
+}
+
+function flushFavorites(beacon) {
+    clearTimeout(favoritesTimer);
+    if (pendingFavorites.size === 0) {
+        return;
+    }
+
+    var body = { add: [], remove: [] };
+    pendingFavorites.forEach(function (action, recipeId) {
+        body[action].push(recipeId);
+    });
+    pendingFavorites.clear();
 
-    fetch(`/api/v1/recipes/${recipeId}/favorites/`, {
+    var payload = JSON.stringify(body);
+    if (beacon === true && navigator.sendBeacon) {
+        navigator.sendBeacon(
+            '/api/v1/recipes/favorites/batch',
+            new Blob([payload], { type: 'application/json' })
+        );
+        return;
+    }
+
+    fetch('/api/v1/recipes/favorites/batch', {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json'
         },
-        withCredentials: true,
+        body: payload,
+        credentials: 'same-origin',
+        keepalive: true,
     })
+}
+
+function addToFavorites(recipeId, callback) {
+    queueFavorite(recipeId, 'add');
     console.log('Добавить в любимое:', recipeId);
     callback();
 }
 
 function removeFromFavorites(recipeId, callback) {
-    fetch(`/api/v1/recipes/${recipeId}/favorites/`, {
-        method: 'DELETE',
-        headers: {
-            'Content-Type': 'application/json'
-        },
-        withCredentials: true,
-    })
+    queueFavorite(recipeId, 'remove');
     console.log('Удалить из любимого:', recipeId);
     callback();
 }
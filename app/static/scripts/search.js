@@ -42,18 +42,23 @@ document.querySelector('form.search').addEventListener('submit', function (event
         }
     });
 
-    let searchQuery = `/?`
+    var params = new URLSearchParams()
     if (name !== '')
-        searchQuery += `name=${name}`
+        params.append('q', name)
 
     for (let ingredient of ingredients) {
-        searchQuery += `&ingredients=${ingredient}`
+        params.append('ingredients', ingredient)
     }
 
     for (let tag of tags) {
-        searchQuery += `&tags=${tag}`
+        params.append('tags', tag)
     }
 
+    var limit = new URLSearchParams(location.search).get('limit')
+    if (limit !== null)
+        params.append('limit', limit)
+
+    let searchQuery = `/?${params.toString()}`
     location.replace(searchQuery);
     console.log('Поиск:', searchQuery);
 });
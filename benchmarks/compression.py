@@ -0,0 +1,51 @@
+import argparse
+import time
+
+from app.core.compression import BrotliEncoder, GzipEncoder, brotli
+from app.core.models.recipe import RecipeSchema
+from app.core.responses import dumps
+from benchmarks.serialization import PageSchema, make_rows
+
+
+def recipe_page(rows: int) -> bytes:
+    return dumps(
+        PageSchema.model_construct(
+            items=[RecipeSchema.from_row(row) for row in make_rows(rows)],
+            next_cursor="eyJrIjoxLCJpZCI6IjAwMDAwMDAwIn0",
+        )
+    )
+
+
+def encoders() -> list[tuple[str, type | None, int]]:
+    result: list[tuple[str, type | None, int]] = [("identity", None, 0)]
+    result += [(f"gzip {level}", GzipEncoder, level) for level in (1, 4, 6, 9)]
+    if brotli is not None:
+        result += [
+            (f"br {quality}", BrotliEncoder, quality) for quality in (1, 4, 6, 11)
+        ]
+    return result
+
+
+def main(args: argparse.Namespace):
+    body = recipe_page(args.rows)
+    if brotli is None:
+        print("brotli is not installed, skipping br")
+
+    for name, encoder, level in encoders():
+        started_at = time.process_time()
+        for _ in range(args.repeat):
+            encoded = encoder(level).finish(body) if encoder else body
+        cpu_time = (time.process_time() - started_at) / args.repeat
+        print(
+            f"{name:<10} bytes={len(encoded):<7} "
+            f"ratio={len(encoded) / len(body):6.3f} cpu={cpu_time * 1e6:9.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Bytes on the wire and CPU time per compressed recipe page"
+    )
+    parser.add_argument("--rows", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=200)
+    main(parser.parse_args())
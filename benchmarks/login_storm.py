@@ -0,0 +1,136 @@
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+
+from app.auth.passwords import password_hasher
+from app.main import app
+
+BASE_URL = "https://testserver"
+PASSWORD = "benchmark-password"
+
+
+async def run_inline(func, *args):
+    return func(*args)
+
+
+async def read_recipes(
+    client: httpx.AsyncClient,
+    recipe_ids: list[str],
+    interval: float,
+    stop: asyncio.Event,
+    latencies: list[float],
+):
+    index = 0
+    while not stop.is_set():
+        recipe_id = recipe_ids[index % len(recipe_ids)]
+        started_at = time.perf_counter()
+        response = await client.get(f"/api/v1/recipes/{recipe_id}")
+        latencies.append(time.perf_counter() - started_at)
+        response.raise_for_status()
+        index += 1
+        await asyncio.sleep(interval)
+
+
+async def authenticate(
+    url: str, data: dict[str, str], semaphore: asyncio.Semaphore | None = None
+):
+    async with semaphore or asyncio.Semaphore():
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url=BASE_URL
+        ) as client:
+            response = await client.post(url, data=data)
+            response.raise_for_status()
+
+
+async def measure(
+    client: httpx.AsyncClient,
+    recipe_ids: list[str],
+    args: argparse.Namespace,
+    emails: list[str] | None,
+) -> tuple[list[float], float]:
+    stop = asyncio.Event()
+    latencies: list[float] = []
+    readers = [
+        asyncio.create_task(
+            read_recipes(client, recipe_ids, args.interval, stop, latencies)
+        )
+        for _ in range(args.readers)
+    ]
+
+    started_at = time.perf_counter()
+    if emails is None:
+        await asyncio.sleep(args.duration)
+    else:
+        semaphore = asyncio.Semaphore(args.concurrency)
+        await asyncio.gather(
+            *(
+                authenticate(
+                    "/api/v1/auth/login",
+                    {"email": email, "password": PASSWORD},
+                    semaphore,
+                )
+                for email in emails
+            )
+        )
+    elapsed = time.perf_counter() - started_at
+
+    stop.set()
+    await asyncio.gather(*readers)
+    return latencies, elapsed
+
+
+def report(name: str, latencies: list[float], elapsed: float):
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{name:<12} reads={len(latencies):<6} "
+        f"p50={quantiles[49] * 1000:7.2f}ms "
+        f"p99={quantiles[98] * 1000:7.2f}ms "
+        f"max={max(latencies) * 1000:7.2f}ms "
+        f"elapsed={elapsed:6.2f}s"
+    )
+
+
+async def main(args: argparse.Namespace):
+    if args.inline:
+        password_hasher.run = run_inline  # type: ignore
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url=BASE_URL
+    ) as client:
+        emails = [
+            f"benchmark-{uuid.uuid4().hex[:12]}@example.com" for _ in range(args.logins)
+        ]
+        for email in emails:
+            await authenticate(
+                "/api/v1/auth/register",
+                {"email": email, "nickname": "benchmark", "password": PASSWORD},
+            )
+
+        response = await client.get("/api/v1/recipes/", params={"limit": 50})
+        response.raise_for_status()
+        recipe_ids = [recipe["recipe_id"] for recipe in response.json()["items"]]
+
+        latencies, elapsed = await measure(client, recipe_ids, args, None)
+        report("idle", latencies, elapsed)
+
+        latencies, elapsed = await measure(client, recipe_ids, args, emails)
+        report("login storm", latencies, elapsed)
+
+    print(f"password hasher: {password_hasher.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="p99 latency of recipe reads while logins are being hashed"
+    )
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--interval", type=float, default=0.005)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--inline", action="store_true")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,124 @@
+import argparse
+import asyncio
+import time
+from datetime import datetime
+from random import Random
+from uuid import UUID, uuid4
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.models.recipe import Recipe, RecipePageSchema, RecipeSchema
+from app.core.responses import JSONBytesResponse, dumps
+
+PageSchema = RecipePageSchema[RecipeSchema]
+
+WORDS = (
+    "flour sugar butter egg milk salt pepper onion garlic tomato potato carrot "
+    "chicken beef pork rice pasta cheese cream oil lemon basil parsley dill "
+    "mix stir bake fry boil simmer chop slice whisk knead season serve cool "
+    "until golden soft tender minutes oven pan pot bowl heat low medium high "
+    "add the with and into over for then a of to in on"
+).split()
+
+
+def make_rows(count: int, seed: int = 0) -> list[dict]:
+    random = Random(seed)
+
+    def text(words: int) -> str:
+        return " ".join(random.choices(WORDS, k=words)).capitalize() + "."
+
+    return [
+        {
+            "recipe_id": UUID(int=random.getrandbits(128)),
+            "version": 1,
+            "updated_at": datetime.now(),
+            "name": f"{text(3)[:-1]} {i}",
+            "description": text(25),
+            "action_to_cook": text(120),
+            "image_link": f"https://images.example.com/{uuid4()}.jpg",
+            "ingredients": {
+                random.choice(WORDS): f"{random.randint(1, 500)} g"
+                for _ in range(random.randint(3, 12))
+            },
+            "tags": random.sample(WORDS, random.randint(1, 5)),
+            "favorite_count": random.randint(0, 1000),
+            "is_favorite": False,
+        }
+        for i in range(count)
+    ]
+
+
+def make_recipes(rows: list[dict]) -> list[tuple[Recipe, str]]:
+    return [
+        (
+            Recipe(
+                **{
+                    name: value
+                    for name, value in row.items()
+                    if name not in ("image_link", "is_favorite")
+                }
+            ),
+            row["image_link"],
+        )
+        for row in rows
+    ]
+
+
+response_field = create_response_field(name="Response", type_=PageSchema)
+
+
+async def orm_revalidated(recipes: list[tuple[Recipe, str]]) -> bytes:
+    page = PageSchema(
+        items=[
+            recipe.to_schema(image_link=image_link) for recipe, image_link in recipes
+        ]
+    )
+    content = await serialize_response(field=response_field, response_content=page)
+    return JSONResponse(content).body
+
+
+async def row_serializer(rows: list[dict]) -> bytes:
+    page = PageSchema.model_construct(
+        items=[RecipeSchema.from_row(row) for row in rows]
+    )
+    return JSONBytesResponse(page).body
+
+
+async def row_orjson(rows: list[dict]) -> bytes:
+    return b"[" + b",".join(dumps(row) for row in rows) + b"]"
+
+
+async def measure(func, data, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        await func(data)
+        best = min(best, time.perf_counter() - started_at)
+    return best
+
+
+async def main(args: argparse.Namespace):
+    rows = make_rows(args.rows)
+    recipes = make_recipes(rows)
+    for name, func, data in (
+        ("to_schema + revalidation", orm_revalidated, recipes),
+        ("from_row + serializer", row_serializer, rows),
+        ("orjson projected rows", row_orjson, rows),
+    ):
+        body = await func(data)
+        best = await measure(func, data, args.repeat)
+        print(
+            f"{name:<26} page={best * 1e6:9.1f}us "
+            f"per recipe={best / args.rows * 1e6:7.2f}us bytes={len(body)}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Time serializing one page of recipes through each response path"
+    )
+    parser.add_argument("--rows", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=200)
+    asyncio.run(main(parser.parse_args()))
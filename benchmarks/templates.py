@@ -0,0 +1,78 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SCENARIOS = (
+    ("no bytecode cache", None),
+    ("empty bytecode cache", "empty"),
+    ("filled bytecode cache", "filled"),
+)
+
+
+def url_for(name: str, **params) -> str:
+    return f"/{name}/{params['path']}"
+
+
+def first_render(warm_up: bool) -> dict[str, float]:
+    from app.core.templates import templates, warm_up_templates
+    from benchmarks.serialization import make_rows
+
+    recipes = make_rows(20)
+
+    started_at = time.perf_counter()
+    if warm_up:
+        warm_up_templates()
+    ready_at = time.perf_counter()
+    templates.get_template("index.html").render(
+        url_for=url_for, user=None, recipes=recipes, next_url="/?cursor=x"
+    )
+    rendered_at = time.perf_counter()
+    return {"startup": ready_at - started_at, "render": rendered_at - ready_at}
+
+
+def run_child(cache_dir: str | None, warm_up: bool) -> dict[str, float]:
+    command = [sys.executable, "-m", "benchmarks.templates", "--child"]
+    if warm_up:
+        command.append("--warm-up")
+    env = {**os.environ, "TEMPLATES_BYTECODE_CACHE_DIR": cache_dir or ""}
+    output = subprocess.run(
+        command, env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main(args: argparse.Namespace):
+    for warm_up in (False, True):
+        for name, cache in SCENARIOS:
+            results = []
+            for _ in range(args.repeat):
+                with tempfile.TemporaryDirectory() as cache_dir:
+                    if cache == "filled":
+                        run_child(cache_dir, warm_up=True)
+                    results.append(run_child(cache and cache_dir, warm_up))
+
+            startup = statistics.median(result["startup"] for result in results)
+            render = statistics.median(result["render"] for result in results)
+            print(
+                f"{name:<22} warm_up={warm_up!s:<5} "
+                f"startup={startup * 1000:7.2f}ms first_render={render * 1000:7.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Time to first render of index.html in a fresh process"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--warm-up", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        print(json.dumps(first_render(args.warm_up)))
+    else:
+        main(args)
@@ -4,4 +4,6 @@ ls -la
 
 alembic upgrade head
 
+python -m app.core.assets
+
 uvicorn app.main:app --host 0.0.0.0 --port 8000
@@ -0,0 +1,170 @@
+import asyncio
+import os
+import tempfile
+import uuid
+
+import pytest
+from dotenv import load_dotenv
+
+load_dotenv()
+
+TEST_ENV_DEFAULTS = {
+    "POSTGRES_USER": "postgres",
+    "POSTGRES_PASSWORD": "postgres",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+    "USER_SESSION_COOKIE_NAME": "X-User-Session-Id",
+    "USER_SESSION_EXP": "3600",
+    "USER_SESSION_REFRESH": "600",
+    "SALT_SIZE": "16",
+}
+
+for name, value in TEST_ENV_DEFAULTS.items():
+    os.environ[name] = os.environ.get(name) or value
+
+os.environ["POSTGRES_DB"] = os.environ.get("POSTGRES_TEST_DB", "recipes_test")
+os.environ["POSTGRES_REPLICA_HOST"] = ""
+os.environ["CACHE_BACKEND"] = "sqlite"
+os.environ["CACHE_URL"] = os.path.join(tempfile.mkdtemp(), "cache.sqlite3")
+os.environ["DB_ECHO"] = "false"
+os.environ["USER_SESSION_MODE"] = "db"
+
+import asyncpg  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event, make_url, text  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+from sqlalchemy.pool import NullPool  # noqa: E402
+
+from app.core.config import ASYNC_DATABASE_URL, DATABASE_URL  # noqa: E402
+from app.core.database import async_engine  # noqa: E402
+from app.core.models.base import BaseORM  # noqa: E402
+from app.core.models.recipe import Recipe  # noqa: E402
+from app.main import app  # noqa: E402
+
+RECIPES_COUNT = 50
+
+
+async def create_database():
+    url = make_url(DATABASE_URL)
+    connection = await asyncpg.connect(
+        user=url.username,
+        password=url.password,
+        host=url.host,
+        port=url.port,
+        database="postgres",
+    )
+    try:
+        exists = await connection.fetchval(
+            "SELECT 1 FROM pg_database WHERE datname = $1", url.database
+        )
+        if not exists:
+            await connection.execute(f'CREATE DATABASE "{url.database}"')
+    finally:
+        await connection.close()
+
+
+async def create_schema():
+    engine = create_async_engine(ASYNC_DATABASE_URL, poolclass=NullPool)
+    try:
+        async with engine.begin() as connection:
+            trgm = await connection.scalar(
+                text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+            )
+            if trgm:
+                await connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            else:
+                for index in list(Recipe.__table__.indexes):
+                    if index.name == "ix_recipes_name_trgm":
+                        Recipe.__table__.indexes.discard(index)
+
+            await connection.run_sync(BaseORM.metadata.drop_all)
+            await connection.run_sync(BaseORM.metadata.create_all)
+            await connection.execute(
+                text(
+                    "INSERT INTO images (image_id, image_link) "
+                    "SELECT md5(g::text)::uuid, 'https://images.test/' || g "
+                    "FROM generate_series(1, :count) g"
+                ),
+                {"count": RECIPES_COUNT},
+            )
+            await connection.execute(
+                text(
+                    "INSERT INTO recipes (recipe_id, image_id, name, description, "
+                    "action_to_cook, ingredients, tags, version, created_at, "
+                    "updated_at, favorite_count) "
+                    "SELECT gen_random_uuid(), md5(g::text)::uuid, 'recipe ' || g, "
+                    "'description', 'cook', "
+                    "jsonb_build_object('ingredient ' || g % 5, '1'), "
+                    "jsonb_build_array('tag' || g % 3), 1, "
+                    "now() - g * interval '1 minute', now(), g % 7 "
+                    "FROM generate_series(1, :count) g"
+                ),
+                {"count": RECIPES_COUNT},
+            )
+            await connection.execute(
+                text(
+                    "INSERT INTO recipe_scores (recipe_id, trending, updated_at) "
+                    "SELECT recipe_id, favorite_count, now() FROM recipes"
+                )
+            )
+            await connection.execute(text("ANALYZE"))
+    finally:
+        await engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def database():
+    try:
+        asyncio.run(create_database())
+    except (OSError, asyncpg.PostgresError) as e:
+        pytest.skip(f"PostgreSQL is not available: {e}")
+    asyncio.run(create_schema())
+
+
+@pytest.fixture(scope="session")
+def client(database):
+    with TestClient(app, base_url="https://testserver") as client:
+        yield client
+
+
+@pytest.fixture
+def user(client):
+    response = client.post(
+        "/api/v1/auth/register",
+        data={
+            "email": f"{uuid.uuid4().hex[:12]}@example.com",
+            "nickname": "tester",
+            "password": "password1",
+        },
+    )
+    assert response.status_code == 200, response.text
+    assert client.get("/api/v1/auth/info").status_code == 200
+    yield
+    client.cookies.clear()
+
+
+class QueryCounter:
+    def __init__(self):
+        self.statements: list[str] = []
+        self.checkouts = 0
+
+    def reset(self):
+        self.statements.clear()
+        self.checkouts = 0
+
+    def on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        self.checkouts += 1
+
+
+@pytest.fixture
+def queries(client):
+    counter = QueryCounter()
+    engine = async_engine.sync_engine
+    event.listen(engine, "before_cursor_execute", counter.on_execute)
+    event.listen(engine.pool, "checkout", counter.on_checkout)
+    yield counter
+    event.remove(engine, "before_cursor_execute", counter.on_execute)
+    event.remove(engine.pool, "checkout", counter.on_checkout)
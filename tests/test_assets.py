@@ -0,0 +1,57 @@
+import pytest
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+from app.core import assets
+from app.core.assets import PrecompressedStaticFiles, build_assets
+from app.core.compression import CompressionMiddleware
+
+CONTENT = "body { color: black; }\n" * 200
+
+
+@pytest.fixture
+def client(tmp_path):
+    source = tmp_path / "static"
+    source.mkdir()
+    (source / "site.css").write_text(CONTENT)
+    manifest = build_assets(str(source), str(tmp_path / "build"))
+
+    app = Starlette(
+        routes=[
+            Mount(
+                "/static",
+                PrecompressedStaticFiles(
+                    directory=str(tmp_path / "build"),
+                    immutable=set(manifest.values()),
+                ),
+            )
+        ]
+    )
+    app.add_middleware(CompressionMiddleware)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "content_encoding"),
+    [
+        ("", None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("GZIP", "gzip"),
+        ("gzip;q=0", None),
+        ("gzip;q=0, identity", None),
+        ("x-gzip", None),
+        ("br;q=0, gzip", "gzip"),
+        ("br, gzip", "br" if assets.brotli else "gzip"),
+    ],
+)
+def test_precompressed_encoding(client, accept_encoding, content_encoding):
+    response = client.get(
+        "/static/site.css", headers={"Accept-Encoding": accept_encoding}
+    )
+
+    assert response.status_code == 200
+    assert response.headers.get("content-encoding") == content_encoding
+    assert response.text == CONTENT
+    assert response.headers["vary"] == "Accept-Encoding"
@@ -0,0 +1,177 @@
+import asyncio
+from datetime import date, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from app.auth import helpers
+from app.auth.helpers import get_cached_session, set_cached_session
+from app.core import cache as cache_module
+from app.core.cache import (
+    CacheBackend,
+    MemoryCacheBackend,
+    SqliteCacheBackend,
+    TTLCache,
+)
+from app.core.models.user import Role, UserSchema, UserSessionSchema
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_get_returns_value_until_expiry(clock):
+    cache = TTLCache(maxsize=10, ttl=5)
+    cache.set("a", 1)
+
+    clock[0] += 4.9
+    assert cache.get("a") == 1
+
+    clock[0] += 0.1
+    assert cache.get("a") is None
+    assert cache.get("a", "default") == "default"
+    assert cache.stats() == {
+        "size": 0,
+        "maxsize": 10,
+        "hits": 1,
+        "misses": 2,
+        "evictions": 0,
+    }
+
+
+def test_per_key_ttl_overrides_default(clock):
+    cache = TTLCache(maxsize=10, ttl=5)
+    cache.set("short", 1, ttl=1)
+    cache.set("long", 2, ttl=60)
+
+    clock[0] += 30
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+
+
+def test_set_refreshes_expiry(clock):
+    cache = TTLCache(maxsize=10, ttl=5)
+    cache.set("a", 1)
+
+    clock[0] += 4
+    cache.set("a", 2)
+    clock[0] += 4
+    assert cache.get("a") == 2
+
+
+def test_evicts_least_recently_used(clock):
+    cache = TTLCache(maxsize=3, ttl=60)
+    for key in "abc":
+        cache.set(key, key)
+
+    assert cache.get("a") == "a"
+    cache.set("d", "d")
+
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in "acd"] == ["a", "c", "d"]
+    assert cache.stats()["size"] == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_overwrite_does_not_evict(clock):
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("a", 3)
+
+    assert cache.get("a") == 3
+    assert cache.get("b") == 2
+    assert cache.evictions == 0
+
+
+def test_delete_and_clear(clock):
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.delete("a")
+    cache.delete("missing")
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+    cache.clear()
+    assert cache.get("b") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_falsy_values_are_cached(clock):
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("empty", [])
+    cache.set("zero", 0)
+
+    assert cache.get("empty", "default") == []
+    assert cache.get("zero", "default") == 0
+    assert cache.hits == 2
+
+
+@pytest.mark.parametrize("shared", [True, False])
+def test_sessions_are_cached_only_in_shared_backend(monkeypatch, shared):
+    backend = MemoryCacheBackend(10)
+    monkeypatch.setattr(backend, "shared", shared)
+    monkeypatch.setattr(helpers, "cache", backend)
+    user_session = UserSessionSchema(
+        session_id=uuid4(),
+        expiration_at=datetime.utcnow() + timedelta(hours=1),
+        created_at=datetime.utcnow(),
+        user=UserSchema(
+            user_id=uuid4(),
+            nickname="tester",
+            email="tester@example.com",
+            created_at=date.today(),
+            role=Role.USER,
+        ),
+    )
+
+    async def round_trip():
+        await set_cached_session(user_session)
+        return await get_cached_session(user_session.user.user_id)
+
+    cached = asyncio.run(round_trip())
+
+    assert cached == (user_session if shared else None)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryCacheBackend(2)
+    return SqliteCacheBackend(str(tmp_path / "cache.sqlite3"), 2)
+
+
+def test_backend_contract(backend):
+    async def exercise():
+        await backend.set("a", b"1", 60)
+        await backend.set("expired", b"2", -1)
+        values = [await backend.get("a"), await backend.get("expired")]
+
+        await backend.delete("a", "missing")
+        values.append(await backend.get("a"))
+
+        counters = [await backend.get_counter("n")]
+        counters += [await backend.incr("n"), await backend.incr("n")]
+        counters.append(await backend.get_counter("n"))
+        return values, counters, await backend.stats()
+
+    values, counters, stats = asyncio.run(exercise())
+
+    assert values == [b"1", None, None]
+    assert counters == [0, 1, 2, 2]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_backend_requires_every_method():
+    class PartialBackend(CacheBackend):
+        async def get(self, key: str) -> bytes | None:
+            return None
+
+    with pytest.raises(TypeError):
+        PartialBackend()  # type: ignore[abstract]
@@ -0,0 +1,63 @@
+import pytest
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, Response
+from starlette.routing import Route
+
+from app.core.compression import CompressionMiddleware, accepted_encodings
+
+BODY = "recipe " * 200
+
+
+def text(request):
+    return PlainTextResponse(BODY, headers=dict(request.query_params))
+
+
+def image(request):
+    return Response(b"\x89PNG" * 200, media_type="image/png")
+
+
+@pytest.fixture
+def client():
+    app = Starlette(routes=[Route("/text", text), Route("/image", image)])
+    app.add_middleware(CompressionMiddleware)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        ("gzip, br", {"gzip", "br"}),
+        ("GZip;q=0.5, br;q=0", {"gzip"}),
+        ("gzip;q=0.0, identity", {"identity"}),
+        ("gzip;q=abc", set()),
+    ],
+)
+def test_accepted_encodings(accept_encoding, expected):
+    assert accepted_encodings(accept_encoding) == expected
+
+
+@pytest.mark.parametrize("accept_encoding", ["", "identity", "gzip"])
+def test_vary_on_compressible_responses(client, accept_encoding):
+    response = client.get("/text", headers={"Accept-Encoding": accept_encoding})
+
+    assert response.text == BODY
+    assert response.headers["vary"] == "Accept-Encoding"
+
+
+@pytest.mark.parametrize("vary", ["Accept-Encoding", "accept-encoding", "Cookie"])
+def test_vary_is_not_duplicated(client, vary):
+    response = client.get(
+        "/text", params={"Vary": vary}, headers={"Accept-Encoding": "gzip"}
+    )
+
+    assert response.headers["content-encoding"] == "gzip"
+    items = [item.strip().lower() for item in response.headers["vary"].split(",")]
+    assert items.count("accept-encoding") == 1
+
+
+def test_no_vary_on_incompressible_responses(client):
+    response = client.get("/image", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert "vary" not in response.headers
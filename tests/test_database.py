@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import ASYNC_DATABASE_URL
+from app.core.database import TimedQueuePool
+
+
+async def hold_connections(pool_size: int, max_overflow: int, connections: int):
+    engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        poolclass=TimedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=5,
+    )
+    pool = engine.pool
+
+    async def hold():
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT pg_sleep(0.05)"))
+
+    try:
+        await asyncio.gather(*(hold() for _ in range(connections)))
+        return pool.stats()
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.parametrize(
+    ("pool_size", "max_overflow", "connections", "waits"),
+    [
+        (2, 0, 2, 0),
+        (2, 0, 3, 1),
+        (1, 1, 2, 0),
+        (1, 1, 4, 2),
+        (1, -1, 3, 0),
+    ],
+)
+def test_pool_counts_waits(database, pool_size, max_overflow, connections, waits):
+    stats = asyncio.run(hold_connections(pool_size, max_overflow, connections))
+
+    assert stats["checkouts"] == connections
+    assert stats["waits"] == waits
+    assert stats["max_overflow"] == max_overflow
+    assert stats["checked_out"] == 0
+    assert (stats["wait_time_max"] > 0) == (waits > 0)
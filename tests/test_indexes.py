@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import NullPool
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.core.config import ASYNC_DATABASE_URL
+from app.core.models.recipe import Recipe
+from app.recipes.search import recipe_filters
+
+
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, query):
+        self.query = query
+
+
+@compiles(Explain, "postgresql")
+def compile_explain(element, compiler, **kw):
+    return "EXPLAIN " + compiler.process(element.query, **kw)
+
+
+async def explain(query) -> str:
+    engine = create_async_engine(ASYNC_DATABASE_URL, poolclass=NullPool)
+    try:
+        async with engine.connect() as connection:
+            await connection.execute(text("SET enable_seqscan = off"))
+            plan = await connection.scalars(Explain(query))
+            return "\n".join(plan)
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.parametrize(
+    "filters, index",
+    [
+        ({"tags": ["tag1"]}, "ix_recipes_tags"),
+        ({"tags": ["tag1", "tag2"]}, "ix_recipes_tags"),
+        ({"ingredients": ["ingredient 1"]}, "ix_recipes_ingredients"),
+        ({"ingredients": ["ingredient 1", "ingredient 2"]}, "ix_recipes_ingredients"),
+    ],
+)
+def test_filter_uses_index(database, filters, index):
+    query = select(Recipe.recipe_id).where(*recipe_filters(**filters))
+
+    assert index in asyncio.run(explain(query))
@@ -0,0 +1,63 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.recipes.pagination import decode_cursor, encode_cursor
+
+
+def raw_cursor(payload: bytes) -> str:
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+@pytest.mark.parametrize(
+    "key, key_type",
+    [
+        (12.5, float),
+        (42, int),
+        (datetime(2024, 5, 21, 22, 42, 1, 123456), datetime.fromisoformat),
+        ("Борщ", str),
+    ],
+)
+def test_cursor_round_trip(key, key_type):
+    recipe_id = uuid4()
+
+    assert decode_cursor(encode_cursor(key, recipe_id), key_type, UUID) == [
+        key,
+        recipe_id,
+    ]
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "",
+        "!!!",
+        "a",
+        raw_cursor(b"not json"),
+        raw_cursor(b"\xff\xfe"),
+        raw_cursor(b'{"k": 1}'),
+        raw_cursor(b"[1.5]"),
+        raw_cursor(json.dumps([1.5, str(uuid4()), 3]).encode()),
+        raw_cursor(json.dumps(["fast", str(uuid4())]).encode()),
+        raw_cursor(json.dumps([None, str(uuid4())]).encode()),
+        raw_cursor(b'[1.5, "not a uuid"]'),
+        raw_cursor(b"[1.5, 5]"),
+        raw_cursor(b"[1.5, null]"),
+    ],
+)
+def test_bad_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as e:
+        decode_cursor(cursor, float, UUID)
+    assert e.value.status_code == 400
+
+
+def test_bad_datetime_cursor_is_rejected():
+    cursor = encode_cursor("yesterday", uuid4())
+
+    with pytest.raises(HTTPException) as e:
+        decode_cursor(cursor, datetime.fromisoformat, UUID)
+    assert e.value.status_code == 400
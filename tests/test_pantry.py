@@ -0,0 +1,128 @@
+import asyncio
+from random import Random
+from uuid import UUID
+
+import pytest
+
+from app.recipes import pantry
+from app.recipes.cache import invalidate_recipe
+from app.recipes.pantry import PantryIndex, normalize_ingredient
+
+TERMS = [f"ingredient {i}" for i in range(300)]
+
+
+def spell(random: Random, term: str) -> str:
+    name = random.choice([term, term.upper(), term.title(), f"  {term} "])
+    return name.replace(" ", random.choice([" ", "  ", "\t"]))
+
+
+def make_recipes(seed: int, count: int) -> list[tuple[UUID, list[str]]]:
+    random = Random(seed)
+    weights = [1 / (i + 1) for i in range(len(TERMS))]
+    recipe_ids = sorted(UUID(int=random.getrandbits(128)) for _ in range(count))
+    return [
+        (
+            recipe_id,
+            [
+                spell(random, term)
+                for term in random.choices(TERMS, weights, k=random.randint(1, 10))
+            ],
+        )
+        for recipe_id in recipe_ids
+    ]
+
+
+def build_index(recipes: list[tuple[UUID, list[str]]], generation: int = 0):
+    rows = [(recipe_id, name) for recipe_id, names in recipes for name in names]
+    index = PantryIndex(generation)
+    for i in range(0, len(rows), 1000):
+        index.add(rows[i : i + 1000])
+    return index.build()
+
+
+def brute_force(
+    recipes: list[tuple[UUID, list[str]]],
+    pantry_names: list[str],
+    limit: int,
+    max_missing: int | None,
+) -> list[tuple[UUID, int, list[str]]]:
+    terms = {normalize_ingredient(name) for name in pantry_names}
+    ranked = []
+    for position, (recipe_id, names) in enumerate(recipes):
+        unique = {}
+        for name in names:
+            unique.setdefault(normalize_ingredient(name), name)
+        missing = [name for term, name in unique.items() if term not in terms]
+        matched = len(unique) - len(missing)
+        if matched < 1 or (max_missing is not None and len(missing) > max_missing):
+            continue
+        ranked.append(
+            ((len(missing), -len(unique), position), (recipe_id, matched, missing))
+        )
+    return [match for _, match in sorted(ranked)[:limit]]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_match_agrees_with_brute_force(seed):
+    recipes = make_recipes(seed, 2000)
+    index = build_index(recipes)
+    stats = index.stats()
+    assert stats["recipes"] == len(recipes)
+    assert stats["dense_terms"] > 0
+    assert stats["sparse_terms"] > 0
+
+    random = Random(seed)
+    for _ in range(50):
+        pantry_names = [
+            spell(random, term)
+            for term in random.sample(TERMS[:20], random.randint(0, 5))
+            + random.sample(TERMS, random.randint(0, 5))
+        ]
+        limit = random.choice([1, 10, 100, 5000])
+        max_missing = random.choice([None, 0, 1, 3])
+
+        assert index.match(pantry_names, limit, max_missing) == brute_force(
+            recipes, pantry_names, limit, max_missing
+        )
+
+
+def test_match_normalizes_names():
+    recipe_id = UUID(int=1)
+    index = build_index([(recipe_id, ["Egg", " egg ", "Flour  Mix"])])
+
+    assert index.match(["EGG", "flour mix"], 10) == [(recipe_id, 2, [])]
+    assert index.match(["egg"], 10) == [(recipe_id, 1, ["Flour  Mix"])]
+    assert index.match(["milk"], 10) == []
+
+
+def test_index_rebuilds_on_ingredient_change(monkeypatch):
+    recipe_id = UUID(int=1)
+    recipes = [(recipe_id, ["egg"])]
+    loads = []
+
+    async def load_pantry_index(db_session, generation):
+        loads.append(generation)
+        return build_index(recipes, generation)
+
+    monkeypatch.setattr(pantry, "pantry_index", None)
+    monkeypatch.setattr(pantry, "load_pantry_index", load_pantry_index)
+    monkeypatch.setattr(pantry, "RECIPES_PANTRY_REBUILD_INTERVAL", 0)
+
+    async def match(name: str):
+        index = await pantry.get_pantry_index(None)
+        return index.match([name], 10)
+
+    async def scenario():
+        assert await match("egg") == [(recipe_id, 1, [])]
+
+        recipes[0] = (recipe_id, ["milk"])
+        await invalidate_recipe(recipe_id, ingredients=False)
+        assert await match("egg") == [(recipe_id, 1, [])]
+        assert len(loads) == 1
+
+        await invalidate_recipe(recipe_id)
+        assert await match("egg") == []
+        assert await match("milk") == [(recipe_id, 1, [])]
+        assert len(loads) == 2
+
+    asyncio.run(scenario())
@@ -0,0 +1,75 @@
+import base64
+import os
+
+import pytest
+
+from app.auth import passwords
+from app.auth.passwords import (
+    hash_raw_password,
+    password_needs_rehash,
+    verify_raw_password,
+)
+
+
+@pytest.fixture(autouse=True)
+def fast_params(monkeypatch):
+    monkeypatch.setattr(passwords, "PASSWORD_HASH_ALGORITHM", passwords.PBKDF2_SHA256)
+    monkeypatch.setattr(passwords, "PASSWORD_PBKDF2_ITERATIONS", 1000)
+    monkeypatch.setattr(passwords, "PASSWORD_SCRYPT_N", 2**4)
+
+
+def test_hash_round_trip():
+    hashed_password = hash_raw_password("password1")
+
+    assert hashed_password.startswith("pbkdf2_sha256$1000$")
+    assert verify_raw_password("password1", hashed_password)
+    assert not verify_raw_password("password2", hashed_password)
+    assert not password_needs_rehash(hashed_password)
+    assert hash_raw_password("password1") != hashed_password
+
+
+def test_legacy_hash_verifies_and_needs_rehash():
+    salt = os.urandom(passwords.SALT_SIZE)
+    key = passwords._pbkdf2("password1", salt, passwords.LEGACY_PBKDF2_ITERATIONS)
+    hashed_password = base64.b64encode(salt + key).decode()
+
+    assert verify_raw_password("password1", hashed_password)
+    assert not verify_raw_password("password2", hashed_password)
+    assert password_needs_rehash(hashed_password)
+
+
+def test_changed_params_need_rehash(monkeypatch):
+    hashed_password = hash_raw_password("password1")
+    monkeypatch.setattr(passwords, "PASSWORD_PBKDF2_ITERATIONS", 2000)
+
+    assert verify_raw_password("password1", hashed_password)
+    assert password_needs_rehash(hashed_password)
+
+
+def test_changed_algorithm_needs_rehash(monkeypatch):
+    monkeypatch.setattr(passwords, "PASSWORD_HASH_ALGORITHM", passwords.SCRYPT)
+    hashed_password = hash_raw_password("password1")
+    assert hashed_password.startswith("scrypt$16$8$1$")
+    assert verify_raw_password("password1", hashed_password)
+    assert not password_needs_rehash(hashed_password)
+
+    monkeypatch.setattr(passwords, "PASSWORD_HASH_ALGORITHM", passwords.PBKDF2_SHA256)
+    assert verify_raw_password("password1", hashed_password)
+    assert password_needs_rehash(hashed_password)
+
+
+@pytest.mark.parametrize(
+    "hashed_password",
+    [
+        "",
+        "not base64!",
+        "pbkdf2_sha256$x$AA==$AA==",
+        "pbkdf2_sha256$AA==$AA==",
+        "pbkdf2_sha256$1000$AA=$AA==",
+        "md5$1$AA==$AA==",
+        "scrypt$3$8$1$AA==$AA==",
+        "$$$",
+    ],
+)
+def test_malformed_hash_fails_verification(hashed_password):
+    assert not verify_raw_password("password1", hashed_password)
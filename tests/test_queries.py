@@ -0,0 +1,66 @@
+import pytest
+
+from app.recipes import api_routers, services, view_routers
+from app.recipes.cache import invalidate_recipe, recipe_page_key
+
+
+def recipe_ids(client, limit: int) -> list[str]:
+    response = client.get("/api/v1/recipes/", params={"limit": limit})
+    return [recipe["recipe_id"] for recipe in response.json()["items"]]
+
+
+def render(client, queries, url: str) -> tuple[int, int]:
+    queries.reset()
+    response = client.get(url)
+    assert response.status_code == 200, response.text
+    return len(queries.statements), queries.checkouts
+
+
+def test_index_anonymous(client, queries):
+    client.portal.call(invalidate_recipe)
+
+    assert render(client, queries, "/?limit=20") == (1, 1)
+    assert render(client, queries, "/?limit=20") == (0, 0)
+
+
+def test_index_user(client, queries, user):
+    client.portal.call(invalidate_recipe)
+
+    assert render(client, queries, "/?limit=20") == (2, 1)
+    assert render(client, queries, "/?limit=20") == (1, 1)
+
+
+def test_recipe(client, queries, user):
+    (recipe_id,) = recipe_ids(client, 1)
+    client.portal.call(invalidate_recipe, recipe_id)
+
+    assert render(client, queries, f"/recipes/{recipe_id}") == (1, 1)
+    assert render(client, queries, f"/recipes/{recipe_id}") == (0, 0)
+
+
+def test_favorites(client, queries, user):
+    for recipe_id in recipe_ids(client, 10):
+        response = client.post(f"/api/v1/recipes/{recipe_id}/favorites")
+        assert response.status_code == 200, response.text
+
+    assert render(client, queries, "/recipes/favorites") == (1, 1)
+    assert render(client, queries, "/recipes/favorites") == (1, 1)
+
+
+@pytest.fixture
+def page_keys(monkeypatch):
+    calls = []
+
+    async def counting_recipe_page_key(*args):
+        calls.append(args)
+        return await recipe_page_key(*args)
+
+    for module in (api_routers, services, view_routers):
+        monkeypatch.setattr(module, "recipe_page_key", counting_recipe_page_key)
+    return calls
+
+
+@pytest.mark.parametrize("url", ["/?limit=20", "/api/v1/recipes/?limit=20"])
+def test_page_key_computed_once(client, page_keys, url):
+    assert client.get(url).status_code == 200
+    assert len(page_keys) == 1
@@ -0,0 +1,60 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from app.recipes import ranking
+from app.recipes.ranking import flush_pending_scores, record_favorites, record_views
+
+
+@pytest.fixture(autouse=True)
+def pending(monkeypatch):
+    monkeypatch.setattr(ranking, "pending_scores", ranking.Counter())
+    monkeypatch.setattr(ranking, "RECIPES_TRENDING_VIEW_WEIGHT", 1)
+    monkeypatch.setattr(ranking, "RECIPES_TRENDING_FAVORITE_WEIGHT", 5)
+
+
+@pytest.fixture
+def bumps(monkeypatch):
+    calls = []
+
+    async def bump():
+        calls.append(True)
+
+    monkeypatch.setattr(ranking, "bump_recipe_scores_generation", bump)
+    return calls
+
+
+def test_flush_sends_pending_scores(monkeypatch, bumps):
+    recipe_id = uuid4()
+    flushed = []
+
+    async def flush_scores(db_session, scores):
+        flushed.extend(scores)
+
+    monkeypatch.setattr(ranking, "flush_scores", flush_scores)
+    record_views(recipe_id, recipe_id)
+    record_favorites(recipe_id)
+
+    asyncio.run(flush_pending_scores())
+
+    assert flushed == [(recipe_id, 7)]
+    assert not ranking.pending_scores
+    assert bumps == [True]
+
+
+def test_failed_flush_keeps_scores(monkeypatch, bumps):
+    first, second = uuid4(), uuid4()
+
+    async def flush_scores(db_session, scores):
+        record_views(first, second)
+        raise ConnectionError
+
+    monkeypatch.setattr(ranking, "flush_scores", flush_scores)
+    record_favorites(first)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(flush_pending_scores())
+
+    assert ranking.pending_scores == {first: 6, second: 1}
+    assert bumps == []
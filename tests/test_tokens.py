@@ -0,0 +1,97 @@
+import asyncio
+from datetime import date
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException, Response
+
+from app.auth import tokens
+from app.auth.helpers import (
+    SessionService,
+    current_token_user,
+    set_session_generation,
+)
+from app.auth.tokens import decode_session_token, encode_session_token
+from app.core.config import USER_SESSION_COOKIE_NAME
+from app.core.models.user import Role, User
+
+
+@pytest.fixture(autouse=True)
+def secret(monkeypatch):
+    monkeypatch.setattr(tokens, "USER_SESSION_SECRET", "test-secret")
+
+
+@pytest.fixture
+def user():
+    return User(
+        user_id=uuid4(),
+        nickname="tester",
+        email="tester@example.com",
+        hashed_password="",
+        created_at=date.today(),
+        role=Role.USER,
+        session_generation=0,
+    )
+
+
+def test_token_round_trip(user):
+    token = decode_session_token(encode_session_token(user, 3))
+
+    assert token is not None
+    assert token.user.user_id == user.user_id
+    assert token.user.role == Role.USER
+    assert token.generation == 3
+
+
+def flip(value: str) -> str:
+    return ("B" if value[0] == "A" else "A") + value[1:]
+
+
+@pytest.mark.parametrize(
+    "tamper",
+    [
+        lambda payload, signature: f"{flip(payload)}.{signature}",
+        lambda payload, signature: f"{payload}.{flip(signature)}",
+        lambda payload, signature: f"{payload}.",
+        lambda payload, signature: payload,
+        lambda payload, signature: f"{payload}.{signature}.{signature}",
+        lambda payload, signature: "",
+    ],
+)
+def test_tampered_token_is_rejected(user, tamper):
+    payload, signature = encode_session_token(user, 0).split(".")
+
+    assert decode_session_token(tamper(payload, signature)) is None
+
+
+def test_token_signed_with_another_secret_is_rejected(user, monkeypatch):
+    value = encode_session_token(user, 0)
+    monkeypatch.setattr(tokens, "USER_SESSION_SECRET", "another-secret")
+
+    assert decode_session_token(value) is None
+
+
+def test_signed_garbage_is_rejected():
+    payload = tokens._b64encode(b"not json")
+
+    assert decode_session_token(f"{payload}.{tokens._sign(payload)}") is None
+
+
+def test_expired_token_is_rejected(user, monkeypatch):
+    monkeypatch.setattr(tokens, "USER_SESSION_EXP", -1)
+
+    assert decode_session_token(encode_session_token(user, 0)) is None
+
+
+def test_revoked_generation_is_rejected(user):
+    value = encode_session_token(user, 0)
+    response = Response()
+
+    async def authenticate():
+        await set_session_generation(user.user_id, 1)
+        await current_token_user(SessionService(response, None), value, None)
+
+    with pytest.raises(HTTPException) as e:
+        asyncio.run(authenticate())
+    assert e.value.status_code == 401
+    assert f'{USER_SESSION_COOKIE_NAME}=""' in response.headers["set-cookie"]